@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks of the hot paths of the logging classes, in operations per second."""
+
+import logging
+import timeit
+
+import pytest
+
+from pytest_logfest.logging_classes import LogfestDispatcher, LogfestFileHandler, LogfestFormatter, MyMemoryHandler
+
+NUMBER = 10000
+
+
+def _make_record(level=logging.DEBUG):
+    return logging.LogRecord("logfest.tests.test_module.test_name", level, __file__, 1, "Debug log line %d", (1,),
+                             None)
+
+
+def _operations_per_second(function, number=NUMBER):
+    return number / min(timeit.repeat(function, number=number, repeat=3))
+
+
+def bench_memory_handler_should_flush(bench_results):
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=logging.NullHandler())
+    record = _make_record()
+
+    bench_results["memory_handler_should_flush"] = _operations_per_second(lambda: memory_handler.shouldFlush(record))
+
+
+@pytest.mark.parametrize("records", [10, 1000])
+def bench_memory_handler_flush_with_filter_on_info(bench_results, records):
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=logging.NullHandler())
+    debug_record = _make_record()
+    info_record = _make_record(logging.INFO)
+
+    def fill_and_flush():
+        for _ in range(records // 2):
+            memory_handler.handle(debug_record)
+            memory_handler.handle(info_record)
+        memory_handler.flush_with_filter_on_info()
+
+    bench_results["memory_handler_flush_with_filter_on_info-%d" % records] = \
+        _operations_per_second(fill_and_flush, number=100) * records
+
+
+def _make_dispatcher():
+    """A dispatcher routed like --logfest=full: basic log, session-level full log and two module-level full logs"""
+    dispatcher = LogfestDispatcher()
+    dispatcher.add_sink(logging.NullHandler())
+    dispatcher.add_sink(logging.NullHandler(), node="logfest", exact=True)
+    dispatcher.add_sink(logging.NullHandler(), node="logfest.tests.test_module")
+    dispatcher.add_sink(logging.NullHandler(), node="logfest.tests.test_other_module")
+    return dispatcher
+
+
+def bench_dispatcher_sinks_for(bench_results):
+    dispatcher = _make_dispatcher()
+
+    bench_results["dispatcher_sinks_for"] = \
+        _operations_per_second(lambda: dispatcher.sinks_for("logfest.tests.test_module.test_name"))
+
+
+def bench_dispatcher_handle(bench_results):
+    dispatcher = _make_dispatcher()
+    record = _make_record()
+
+    bench_results["dispatcher_handle"] = _operations_per_second(lambda: dispatcher.handle(record))
+
+
+@pytest.mark.parametrize("buffer_size", [0, 65536])
+def bench_file_handler_emit(tmpdir, bench_results, buffer_size):
+    file_handler = LogfestFileHandler(str(tmpdir.join("bench.log")), buffer_size=buffer_size)
+    file_handler.setFormatter(LogfestFormatter())
+    record = _make_record()
+
+    def handle():
+        del record.__dict__["_logfest_formatted"]  # LogfestFormatter formats a record only once
+        file_handler.handle(record)
+
+    try:
+        file_handler.handle(record)
+        bench_results["file_handler_emit-buffer-%d" % buffer_size] = _operations_per_second(handle)
+        bench_results["file_handler_commit-buffer-%d" % buffer_size] = _operations_per_second(file_handler.commit)
+    finally:
+        file_handler.close()
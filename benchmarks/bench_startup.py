@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Measures what logfest costs a pytest run that does not use it: the import time of the plugin and the duration of
+pytest --collect-only with and without the plugin. Both run in subprocesses, the best of REPEAT runs is reported.
+"""
+
+import subprocess
+import sys
+
+REPEAT = 5
+
+TEST_MODULE = """
+def test_{number}():
+    pass
+"""
+
+
+def _logfest_import_time_us():
+    """Returns the import time in microseconds of the modules of pytest_logfest, without pytest itself"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pytest, pytest_logfest.plugin"],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+
+    import_time = 0
+    for line in output.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and fields[-1].strip().startswith("pytest_logfest"):
+            import_time += int(fields[0].split(":")[1])
+    return import_time
+
+
+def bench_import_time(bench_results):
+    bench_results["startup_import_time_ms"] = min(_logfest_import_time_us() for _ in range(REPEAT)) / 1000.0
+
+
+def bench_collect_only(testdir, bench_results):
+    for module in range(10):
+        testdir.tmpdir.join("test_module_%d.py" % module).write(
+            "".join(TEST_MODULE.format(number=number) for number in range(20)))
+
+    def collect(*args):
+        result = testdir.runpytest_subprocess("--collect-only", "-q", "-p", "no:cacheprovider", *args)
+        assert result.ret == 0
+        return result.duration
+
+    without_logfest = min(collect("-p", "no:logfest") for _ in range(REPEAT))
+    with_logfest = min(collect() for _ in range(REPEAT))
+
+    bench_results["startup_collect_only"] = {
+        "without_logfest": without_logfest,
+        "with_logfest": with_logfest,
+        "overhead": with_logfest - without_logfest,
+    }
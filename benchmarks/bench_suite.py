@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Runs a synthetic suite with every --logfest mode and measures records/sec, teardown latency, peak RSS and open file
+descriptors. The suite runs in a subprocess, the measurements are taken by a conftest.py inside the suite.
+"""
+
+import json
+
+import pytest
+
+MEASURING_CONFTEST = """
+import json
+import os
+import resource
+import time
+
+import pytest
+
+measurements = {"teardown_latencies": [], "call_durations": [], "max_open_fds": 0}
+
+
+def _open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    started = time.perf_counter()
+    yield
+    measurements["call_durations"].append(time.perf_counter() - started)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    started = time.perf_counter()
+    yield
+    measurements["teardown_latencies"].append(time.perf_counter() - started)
+    measurements["max_open_fds"] = max(measurements["max_open_fds"], _open_fds() or 0)
+
+
+def pytest_unconfigure(config):
+    measurements["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open("measurements.json", "w") as measurements_file:
+        json.dump(measurements, measurements_file)
+"""
+
+TEST_MODULE = """
+def test_{number}(function_logger):
+    for i in range({records}):
+        function_logger.debug("Debug log line %d of test {number}", i)
+"""
+
+
+@pytest.mark.parametrize("mode", ["quiet", "basic", "full", "failures", "sqlite"])
+def bench_logfest_mode(testdir, request, bench_results, mode):
+    modules = request.config.getoption("bench_modules")
+    tests = request.config.getoption("bench_tests")
+    records = request.config.getoption("bench_records")
+
+    testdir.makeconftest(MEASURING_CONFTEST)
+    for module in range(modules):
+        testdir.tmpdir.join("test_module_%d.py" % module).write(
+            "".join(TEST_MODULE.format(number=number, records=records) for number in range(tests)))
+
+    result = testdir.runpytest_subprocess("--logfest=%s" % mode, "--log-level=debug", "-p", "no:cacheprovider")
+    assert result.ret == 0
+
+    with open(str(testdir.tmpdir.join("measurements.json"))) as measurements_file:
+        measurements = json.load(measurements_file)
+
+    teardown_latencies = sorted(measurements["teardown_latencies"])
+    total_records = modules * tests * records
+    bench_results["mode-%s" % mode] = {
+        "tests": modules * tests,
+        "records": total_records,
+        "wall_time": result.duration,
+        "records_per_second": total_records / sum(measurements["call_durations"]),
+        "teardown_latency_mean": sum(teardown_latencies) / len(teardown_latencies),
+        "teardown_latency_p99": teardown_latencies[int(len(teardown_latencies) * 0.99)],
+        "peak_rss_kb": measurements["peak_rss_kb"],
+        "max_open_fds": measurements["max_open_fds"],
+    }
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+import json
+import platform
+import sys
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-modules", type=int, default=10, help="number of modules in the synthetic suite")
+    parser.addoption("--bench-tests", type=int, default=50, help="number of tests per module in the synthetic suite")
+    parser.addoption("--bench-records", type=int, default=100, help="number of log records per test")
+    parser.addoption("--bench-output", default="benchmark-results.json", help="file the results are written to")
+
+
+@pytest.fixture(scope="session")
+def bench_results(request):
+    """Collects the results of all benchmarks and writes them to --bench-output as JSON"""
+    results = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+
+    yield results["benchmarks"]
+
+    with open(request.config.getoption("bench_output"), "w") as output_file:
+        json.dump(results, output_file, indent=2, sort_keys=True)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Compact binary format for log records, written by BinaryFileHandler and read by logfest-render.
+
+A binary log file starts with MAGIC, followed by frames: a little-endian 4-byte length and a 1-byte frame type,
+followed by length bytes of data. A NAME frame interns a logger name: a 4-byte id followed by the UTF-8 encoded name.
+A RECORD frame contains the time of the record in microseconds since the epoch (8 bytes), the level (1 byte), the id of
+the logger name (4 bytes), followed by the marshalled (msg, args) tuple of the record.
+
+MAGIC is written again whenever a file is opened for appending, so readers skip it between frames.
+"""
+
+import logging
+import marshal
+import struct
+
+SUFFIX = ".logb"
+MAGIC = b"LOGFEST\x01"
+
+NAME_FRAME = 0
+RECORD_FRAME = 1
+
+FRAME_HEADER = struct.Struct("<IB")
+NAME_FIELDS = struct.Struct("<I")
+RECORD_FIELDS = struct.Struct("<qBI")
+
+
+class BinaryRecordEncoder(object):
+    """Encodes log records into frames, interning logger names. Use a new encoder for every opened file."""
+    def __init__(self):
+        self.name_ids = {}
+
+    def encode(self, record):
+        return self.encode_fields(int(record.created * 1000000), record.levelno, record.name, _payload(record))
+
+    def encode_fields(self, created_us, levelno, name, payload):
+        frames = b""
+
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.name_ids)
+            name_data = NAME_FIELDS.pack(name_id) + name.encode("utf-8")
+            frames += FRAME_HEADER.pack(len(name_data), NAME_FRAME) + name_data
+
+        record_data = RECORD_FIELDS.pack(created_us, min(levelno, 255), name_id) + payload
+        return frames + FRAME_HEADER.pack(len(record_data), RECORD_FRAME) + record_data
+
+
+def _payload(record):
+    if record.exc_info or record.exc_text or getattr(record, "stack_info", None):
+        # tracebacks can only be rendered now, so the message is rendered along with it
+        return marshal.dumps((_message_with_traceback(record), None))
+
+    try:
+        return marshal.dumps((record.msg, record.args or None))
+    except ValueError:  # msg or args contain objects marshal does not support
+        return marshal.dumps((record.getMessage(), None))
+
+
+def _message_with_traceback(record):
+    formatter = logging.Formatter("%(message)s")
+    return formatter.format(record)
+
+
+def render_message(msg, args):
+    """Same as LogRecord.getMessage"""
+    msg = str(msg)
+    if args:
+        msg = msg % args
+    return msg
+
+
+def read_frames(binary_file):
+    """Yields (created_us, levelno, name, msg, args) for every log record in an opened binary log file"""
+    names = {}
+
+    while True:
+        header = binary_file.read(FRAME_HEADER.size)
+        if header[:FRAME_HEADER.size] == MAGIC[:FRAME_HEADER.size]:
+            binary_file.read(len(MAGIC) - FRAME_HEADER.size)
+            names = {}
+            continue
+        if len(header) < FRAME_HEADER.size:
+            return
+
+        length, frame_type = FRAME_HEADER.unpack(header)
+        data = binary_file.read(length)
+        if len(data) < length:
+            return  # incomplete last frame, e.g. when the session was killed
+
+        if frame_type == NAME_FRAME:
+            names[NAME_FIELDS.unpack_from(data)[0]] = data[NAME_FIELDS.size:].decode("utf-8")
+        elif frame_type == RECORD_FRAME:
+            created_us, levelno, name_id = RECORD_FIELDS.unpack_from(data)
+            msg, args = marshal.loads(data[RECORD_FIELDS.size:])
+            yield created_us, levelno, names.get(name_id, "?"), msg, args
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import shutil
+import sys
+
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "lzma": ".xz",
+    "zstd": ".zst",
+}
+
+
+def check_compression_available(compression):
+    """Raises ImportError if the module for the compression is not available, like lzma on Python 2 or zstandard"""
+    if compression == "bz2" and sys.version_info[0] == 2:
+        raise ImportError("bz2.BZ2File of Python 2 can neither append nor be read as text")
+
+    _binary_file_class(compression)
+
+
+def _binary_file_class(compression):
+    """Returns the class opening a file through a streaming compressor in binary mode, one Python 2 also has"""
+    if compression == "gzip":
+        import gzip
+        return gzip.GzipFile
+    elif compression == "bz2":
+        import bz2
+        return bz2.BZ2File
+    elif compression == "lzma":
+        import lzma
+        return lzma.LZMAFile
+    elif compression == "zstd":
+        import zstandard
+        return zstandard.open
+    else:
+        raise ValueError("Unknown compression: %s" % compression)
+
+
+def open_compressed(path_to_file, mode, compression, encoding=None, errors=None):
+    """Opens a file through a streaming compressor, in text mode unless 'b' is in mode"""
+    binary_mode = mode.replace("t", "").replace("b", "") + "b"
+    compressed_file = _binary_file_class(compression)(path_to_file, binary_mode)
+    if "b" in mode:
+        return compressed_file
+
+    # gzip.open and friends do the same on Python 3, but do not accept encoding and errors on Python 2
+    return io.TextIOWrapper(compressed_file, encoding=encoding, errors=errors)
+
+
+def split_compression_suffix(path_to_file):
+    """Returns the path without compression suffix and the compression, which is None if there is no such suffix"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path_to_file.endswith(suffix):
+            return path_to_file[:-len(suffix)], compression
+
+    return path_to_file, None
+
+
+def open_log_file(path_to_file, mode="r", encoding="utf-8", errors=None):
+    """Opens a log file, decompressing or compressing it if its suffix is one of COMPRESSION_SUFFIXES"""
+    if "b" in mode:
+        encoding = None
+
+    compression = split_compression_suffix(path_to_file)[1]
+    if compression:
+        return open_compressed(path_to_file, mode, compression, encoding=encoding, errors=errors)
+
+    return io.open(path_to_file, mode, encoding=encoding, errors=errors)
+
+
+def compress_file(path_to_file, compression="gzip"):
+    """Compresses a file to the same path with the suffix of the compression, and removes the original"""
+    with io.open(path_to_file, "rb") as source:
+        with open_compressed(path_to_file + COMPRESSION_SUFFIXES[compression], "wb", compression) as target:
+            shutil.copyfileobj(source, target)
+    os.remove(path_to_file)
@@ -11,3 +11,11 @@ def pytest_logfest_log_file_name_full_module(filename_components):
 
 def pytest_logfest_log_file_name_full_session(filename_components):
     """Called after filling the array of filename components for the session-level full log file"""
+
+
+def pytest_logfest_postprocessors(config, processors):
+    """
+    Called at the end of the session, before post-processing the log files of the session. Append functions taking the
+    path to a log file to the list of processors to run them on every log file in a process pool, see
+    pytest_logfest.postprocess. Compression with --logfest-postprocess=gzip runs after them.
+    """
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Per-test index of log files written with --logfest-index, and logfest-extract to get the log of a single test.
+
+The index is a JSON Lines file with one entry per test and log file: nodeid, file (relative to the index), offset,
+length and outcome.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import mmap
+import os
+import sys
+
+
+class LogIndexWriter(object):
+    """Appends index entries, one write per entry so several processes can append to the same index"""
+    def __init__(self, path_to_index):
+        self.path_to_index = path_to_index
+
+    def add(self, nodeid, path_to_file, offset, length, outcome):
+        entry = {
+            "nodeid": nodeid,
+            "file": os.path.relpath(path_to_file, os.path.dirname(os.path.abspath(self.path_to_index))),
+            "offset": offset,
+            "length": length,
+            "outcome": outcome,
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+
+        fd = os.open(self.path_to_index, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+def read_index(path_to_index):
+    """Yields the entries of an index, with file as absolute path"""
+    index_dir = os.path.dirname(os.path.abspath(path_to_index))
+    with io.open(path_to_index, "r", encoding="utf-8") as index_file:
+        for line in index_file:
+            entry = json.loads(line)
+            entry["file"] = os.path.join(index_dir, entry["file"])
+            yield entry
+
+
+def read_slice(path_to_file, offset, length):
+    """
+    Returns length bytes from offset, read through mmap so only those pages are read.
+    Falls back to the gzip-compressed file if the log file was compressed after rotation.
+    """
+    if length == 0:
+        return b""
+
+    if not os.path.exists(path_to_file) and os.path.exists(path_to_file + ".gz"):
+        with gzip.open(path_to_file + ".gz", "rb") as log_file:
+            log_file.seek(offset)
+            return log_file.read(length)
+
+    with open(path_to_file, "rb") as log_file:
+        mapped_file = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return mapped_file[offset:offset + length]
+        finally:
+            mapped_file.close()
+
+
+def extract_test_log(path_to_index, nodeid):
+    """Returns a list of (file, log bytes) for the test with nodeid, in the order of the index"""
+    return [(entry["file"], read_slice(entry["file"], entry["offset"], entry["length"]))
+            for entry in read_index(path_to_index) if entry["nodeid"] == nodeid]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="logfest-extract", description="Prints the log of a single test.")
+    parser.add_argument("index", help="index file written with --logfest-index")
+    parser.add_argument("nodeid", help="node id of the test")
+    parser.add_argument("--file", default=None, help="only print the log from files containing this string")
+    args = parser.parse_args(argv)
+
+    out = getattr(sys.stdout, "buffer", sys.stdout)
+    found = False
+    for path_to_file, log in extract_test_log(args.index, args.nodeid):
+        if args.file and args.file not in path_to_file:
+            continue
+        found = True
+        out.write(("==> %s <==\n" % path_to_file).encode("utf-8"))
+        out.write(log)
+    out.flush()
+
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,918 @@
+import collections
+import copy
+import heapq
+import itertools
+import json
+import locale
 import logging.handlers
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import traceback
 
+from pytest_logfest.binary_format import MAGIC, BinaryRecordEncoder
+from pytest_logfest.compression import compress_file, open_compressed, split_compression_suffix
+from pytest_logfest.mmap_writer import DEFAULT_CHUNK_SIZE, MmapAppendStream
 
-class FilterOnLogLevel(logging.Filter):
-    def __init__(self, level):
-        self.level = level
-        super(FilterOnLogLevel, self).__init__()
+try:
+    from time import perf_counter as timer
+except ImportError:
+    from timeit import default_timer as timer
 
-    def filter(self, record):
-        return record.levelno >= self.level
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+# caches keyed on log node names are cleared at this size, function-level log nodes are unique per test
+MAX_CACHED_NAMES = 4096
+
+
+class LogfestFormatter(logging.Formatter):
+    """
+    Formatter for the logfest log format '%(asctime)s %(levelname)s - %(name)s - %(message)s' with time format
+    %H:%M:%S, shared by all logfest file handlers.
+
+    The formatted time is cached per second and the level name and log node part per log node and level. The formatted
+    record is kept on the record, so a record written to several log files is formatted once.
+    """
+    FORMAT = '%(asctime)s %(levelname)s - %(name)s - %(message)s'
+    DATEFMT = "%H:%M:%S"
+
+    def __init__(self):
+        super(LogfestFormatter, self).__init__(self.FORMAT, self.DATEFMT)
+        self._time_cache = (None, None)
+        self._headers = {}
+
+    def format(self, record):
+        formatted = getattr(record, "_logfest_formatted", None)
+        if formatted is not None:
+            return formatted
+
+        record.message = record.getMessage()
+
+        second, asctime = self._time_cache
+        if second != int(record.created):
+            asctime = time.strftime(self.DATEFMT, self.converter(record.created))
+            self._time_cache = (int(record.created), asctime)
+        record.asctime = asctime
+
+        header = self._headers.get((record.name, record.levelname))
+        if header is None:
+            header = " %s - %s - " % (record.levelname, record.name)
+            if len(self._headers) >= MAX_CACHED_NAMES:
+                self._headers = {}
+            self._headers[(record.name, record.levelname)] = header
+
+        formatted = asctime + header + record.message
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if formatted[-1:] != "\n":
+                formatted = formatted + "\n"
+            formatted = formatted + record.exc_text
+        if getattr(record, "stack_info", None):
+            if formatted[-1:] != "\n":
+                formatted = formatted + "\n"
+            formatted = formatted + self.formatStack(record.stack_info)
+
+        record._logfest_formatted = formatted
+        return formatted
+
+
+class PooledLogger(logging.Logger):
+    """
+    Logger that is not registered with the logging manager, so it is not kept forever, and is reused for later tests.
+    It does not cache isEnabledFor, because the manager only clears the caches of the loggers it knows.
+    """
+    def isEnabledFor(self, level):
+        if self.disabled or self.manager.disable >= level:
+            return False
+        return level >= self.getEffectiveLevel()
+
+
+class RecordLimiter(object):
+    """
+    Settings and counters shared by the RecordLimiterFilters of the logfest loggers.
+
+    With collapse_duplicates, consecutive records of a logger with the same level and message template are collapsed
+    into the first one and a record saying how often it was repeated. With rate, every logger may log rate records per
+    second below WARNING, with bursts up to burst records (a token bucket). Records with a true _logfest_unlimited
+    attribute are never dropped. collapsed and rate_limited count the dropped records until reset.
+    """
+    def __init__(self, collapse_duplicates=False, rate=None, burst=None):
+        self.collapse_duplicates = collapse_duplicates
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.collapsed = 0
+        self.rate_limited = 0
+
+    def reset(self):
+        self.collapsed = 0
+        self.rate_limited = 0
 
 
-class FilterOnExactNodename(logging.Filter):
-    def __init__(self, node_name):
-        self.node_name = node_name
-        super(FilterOnExactNodename, self).__init__()
+class RecordLimiterFilter(logging.Filter):
+    """Filter for one logger that collapses duplicate records and rate limits records, see RecordLimiter"""
+    def __init__(self, limiter, logger):
+        super(RecordLimiterFilter, self).__init__()
+        self.limiter = limiter
+        self.logger = logger
+        self.last_record = None
+        self.repeated = 0
+        self.tokens = limiter.burst
+        self.last_refill = timer()
 
     def filter(self, record):
-        return record.name == self.node_name
+        if getattr(record, "_logfest_unlimited", False):
+            return True
+
+        if self.limiter.collapse_duplicates:
+            if self.last_record is not None and self.last_record.levelno == record.levelno and \
+                    self.last_record.msg == record.msg:
+                self.repeated += 1
+                self.limiter.collapsed += 1
+                return False
+
+            self.flush()
+            self.last_record = record
+
+        if self.limiter.rate is not None and record.levelno < logging.WARNING:
+            now = timer()
+            self.tokens = min(self.limiter.burst, self.tokens + (now - self.last_refill) * self.limiter.rate)
+            self.last_refill = now
+            if self.tokens < 1:
+                self.limiter.rate_limited += 1
+                return False
+            self.tokens -= 1
+
+        return True
+
+    def flush(self):
+        """Logs how often the last record was repeated, if it was"""
+        if self.repeated:
+            repeated_record = logging.makeLogRecord({
+                "name": self.logger.name,
+                "levelno": self.last_record.levelno,
+                "levelname": self.last_record.levelname,
+                "msg": "Last log record repeated %d times",
+                "args": (self.repeated,),
+                "_logfest_unlimited": True,
+            })
+            self.repeated = 0
+            self.logger.handle(repeated_record)
+
+
+class LogfestDispatcher(logging.Handler):
+    """
+    Handler at the root log node that hands every record straight to the handlers (sinks) it is routed to, instead of
+    one handler per log node with filters on log node name.
+
+    A sink added without node receives all records, with node it receives the records of that log node and, unless
+    exact, of its descendants. The sinks per log node name are looked up once and kept until the routes change.
+    Records are marked with the nodeid of the current test, if any, as _logfest_nodeid.
+    """
+    def __init__(self):
+        super(LogfestDispatcher, self).__init__()
+        self.nodeid = None
+        self.routes = []
+        self._table = {}
+
+    def add_sink(self, sink, node=None, exact=False):
+        self.routes.append((node, exact, sink))
+        self._table = {}
+
+    def remove_sink(self, sink):
+        self.routes = [route for route in self.routes if route[2] is not sink]
+        self._table = {}
+
+    def sinks_of(self, node):
+        """Returns the sinks routed to exactly this log node"""
+        return [sink for route_node, exact, sink in self.routes if route_node == node]
+
+    def sinks_for(self, name):
+        """Returns the sinks that receive the records of log node name"""
+        sinks = self._table.get(name)
+        if sinks is None:
+            sinks = tuple(sink for node, exact, sink in self.routes
+                          if node is None or name == node or (not exact and name.startswith(node + ".")))
+            if len(self._table) >= MAX_CACHED_NAMES:
+                self._table = {}
+            self._table[name] = sinks
+        return sinks
+
+    def handle(self, record):
+        if self.nodeid is not None and not hasattr(record, "_logfest_nodeid"):
+            record._logfest_nodeid = self.nodeid
+
+        for sink in self.sinks_for(record.name):
+            if record.levelno >= sink.level:
+                sink.handle(record)
+        return True
+
+    def emit(self, record):
+        self.handle(record)
+
+
+class LogfestFileHandler(logging.FileHandler):
+    """
+    FileHandler that optionally collects formatted records and writes them to file with a single write.
+
+    With buffer_size 0 every record is written and flushed immediately, like a regular FileHandler. Otherwise the
+    collected records are written on flush, when they exceed buffer_size bytes or when the oldest collected record is
+    older than buffer_seconds. commit flushes and, with fsync, makes sure the records are on disk.
+
+    With compression the file is written through a streaming compressor. The compressor is only flushed on commit
+    with fsync and on close, flushing it for every record would ruin the compression ratio.
+
+    With stats (a LogStats) the number of records and bytes and the time spent formatting, writing and flushing are
+    counted.
+
+    The directory of the file is created when the file is opened, so with delay nothing is created until the first
+    record is written. created_dirs is a set of directories that already exist, shared by handlers to skip makedirs.
+
+    rotate_if_due starts a new segment when the file is larger than rotate_bytes or older than rotate_seconds. The
+    file itself is never renamed, so offsets in it stay valid: segments are named after the file with a sequence
+    number, e.g. session-<timestamp>.log, session-<timestamp>.1.log, ... Only the last rotate_backups rotated segments
+    are kept, with rotate_compress they are gzip-compressed on a background thread.
+
+    With writer "mmap" uncompressed files are written through a MmapAppendStream, growing the file in chunks of
+    mmap_chunk_size bytes. If the file cannot be memory-mapped or grown, it is written as a regular file.
+    """
+    def __init__(self, filename, mode='a', encoding=None, delay=False, buffer_size=0, buffer_seconds=None,
+                 fsync=False, compression=None, stats=None, created_dirs=None, rotate_bytes=None, rotate_seconds=None,
+                 rotate_backups=None, rotate_compress=False, writer="stream", mmap_chunk_size=DEFAULT_CHUNK_SIZE):
+        self.writer = writer
+        self.mmap_chunk_size = mmap_chunk_size
+        self.created_dirs = created_dirs if created_dirs is not None else set()
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.rotate_backups = rotate_backups
+        self.rotate_compress = rotate_compress
+        self.segment = 0
+        self.segment_started = time.time()
+        self.rotated_segments = []
+        self.buffer_size = buffer_size
+        self.buffer_seconds = buffer_seconds
+        self.fsync = fsync
+        self.compression = compression
+        self.stats = stats
+        self._pending = []
+        self._pending_size = 0
+        self._pending_since = None
+        super(LogfestFileHandler, self).__init__(filename, mode=mode, encoding=encoding, delay=delay)
+        self.segment_base = self.baseFilename
+
+    def emit(self, record):
+        try:
+            if self.stats is None:
+                data = self.serialize(record)
+            else:
+                started = timer()
+                data = self.serialize(record)
+                self.stats.add(records=1, bytes=self._encoded_size(data), format_time=timer() - started)
+
+            if not self.buffer_size:
+                self._write(data)
+                self.flush()
+                return
+
+            self._pending.append(data)
+            self._pending_size += len(data)
+            if self._pending_since is None:
+                self._pending_since = time.time()
+
+            if self._pending_size >= self.buffer_size or \
+                    (self.buffer_seconds is not None and time.time() - self._pending_since >= self.buffer_seconds):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def serialize(self, record):
+        return self.format(record) + "\n"
+
+    def _encoded_size(self, data):
+        """Returns the number of bytes data takes in the log file, before compression"""
+        if isinstance(data, bytes):
+            return len(data)
+        if self.encoding is None or self.encoding == "locale":  # FileHandler sets io.text_encoding(None): 'locale'
+            return len(data.encode(locale.getpreferredencoding(False), "replace"))
+        return len(data.encode(self.encoding, "replace"))
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending:
+                self._write(self._pending[0][:0].join(self._pending))
+                self._pending = []
+                self._pending_size = 0
+                self._pending_since = None
+
+            if self.stream is not None and not self.compression:
+                if self.stats is None:
+                    self.stream.flush()
+                else:
+                    started = timer()
+                    self.stream.flush()
+                    self.stats.add(flush_time=timer() - started)
+        finally:
+            self.release()
+
+    def _write(self, data):
+        if self.stream is None:
+            self.stream = self._open()
+
+        try:
+            self._write_to_stream(data)
+        except EnvironmentError:
+            if not isinstance(self.stream, MmapAppendStream):
+                raise
+            # no disk space could be allocated for the memory-mapped file, continue writing it as a regular file
+            self.stream.close()
+            self.writer = "stream"
+            self.stream = self._open()
+            self._write_to_stream(data)
+
+    def _write_to_stream(self, data):
+        if self.stats is None:
+            self.stream.write(data)
+        else:
+            started = timer()
+            self.stream.write(data)
+            self.stats.add(write_time=timer() - started)
+
+    def tell(self):
+        """Returns the size of the file after writing the collected records, or None if the file is compressed"""
+        if self.compression:
+            return None
+
+        self.acquire()
+        try:
+            self.flush()
+            if self.stream is not None:
+                return self.stream.tell()
+            return os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        finally:
+            self.release()
+
+    def commit(self):
+        self.acquire()
+        try:
+            self.flush()
+            if self.fsync and self.stream is not None:
+                if isinstance(self.stream, MmapAppendStream):
+                    self.stream.sync()
+                else:
+                    if self.compression:
+                        self.stream.flush()
+                    os.fsync(self.stream.fileno())
+        finally:
+            self.release()
+
+    def rotate_if_due(self):
+        """Starts a new segment if the current one is too large or too old, call it between tests"""
+        if not self.rotate_bytes and not self.rotate_seconds:
+            return
+
+        self.acquire()
+        try:
+            self.flush()
+            if isinstance(self.stream, MmapAppendStream):
+                size = self.stream.tell()  # the file itself is grown in chunks
+            else:
+                size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+            if size and ((self.rotate_bytes and size >= self.rotate_bytes) or
+                         (self.rotate_seconds and time.time() - self.segment_started >= self.rotate_seconds)):
+                self._rotate()
+        finally:
+            self.release()
+
+    def _rotate(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        rotated = self.baseFilename
+        self.segment += 1
+        path, compression = split_compression_suffix(self.segment_base)
+        root, ext = os.path.splitext(path)
+        self.baseFilename = "%s.%d%s%s" % (root, self.segment, ext, self.segment_base[len(path):])
+        self.segment_started = time.time()
+
+        compressor = None
+        if self.rotate_compress and not compression:
+            compressor = threading.Thread(target=compress_file, args=(rotated,), name="logfest-rotate-compress")
+            compressor.daemon = True
+            compressor.start()
+        self.rotated_segments.append((rotated, compressor))
+
+        while self.rotate_backups is not None and len(self.rotated_segments) > self.rotate_backups:
+            removed, compressor = self.rotated_segments.pop(0)
+            if compressor is not None:
+                compressor.join()
+            for path_to_segment in [removed, removed + ".gz"]:
+                if os.path.exists(path_to_segment):
+                    os.remove(path_to_segment)
+
+    def close(self):
+        self.acquire()
+        try:
+            self.flush()
+        finally:
+            self.release()
+        super(LogfestFileHandler, self).close()
+
+        for _, compressor in self.rotated_segments:
+            if compressor is not None:
+                compressor.join()
+
+    def _open(self):
+        directory = os.path.dirname(self.baseFilename)
+        if directory not in self.created_dirs:
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+            self.created_dirs.add(directory)
+
+        if self.writer == "mmap" and not self.compression:
+            try:
+                return MmapAppendStream(self.baseFilename, self.mode, encoding=self.encoding,
+                                        chunk_size=self.mmap_chunk_size)
+            except (EnvironmentError, ValueError):
+                self.writer = "stream"
+
+        if self.compression:
+            return open_compressed(self.baseFilename, self.mode, self.compression, encoding=self.encoding)
+        return super(LogfestFileHandler, self)._open()
+
+
+class BinaryFileHandler(LogfestFileHandler):
+    """LogfestFileHandler that writes records in the binary format of pytest_logfest.binary_format, unformatted"""
+    def __init__(self, filename, mode='ab', **kwargs):
+        self.encoder = BinaryRecordEncoder()
+        super(BinaryFileHandler, self).__init__(filename, mode=mode, **kwargs)
+
+    def serialize(self, record):
+        return self.encoder.encode(record)
+
+    def _open(self):
+        stream = super(BinaryFileHandler, self)._open()
+        self.encoder = BinaryRecordEncoder()
+        stream.write(MAGIC)
+        return stream
+
+
+_LOG_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | frozenset(["message", "asctime"])
+
+
+class JsonLinesFileHandler(LogfestFileHandler):
+    """
+    LogfestFileHandler that writes every record as one JSON object per line, with the keys timestamp (seconds since
+    the epoch), level, logger, nodeid (of the test, null outside tests), message, exc_info (if any) and extra (the
+    extra fields of the record, if any). The encoded logger names and levels are cached.
+    """
+    encode_string = staticmethod(json.encoder.encode_basestring_ascii)
+
+    def __init__(self, filename, **kwargs):
+        self._encoded = {}
+        super(JsonLinesFileHandler, self).__init__(filename, **kwargs)
+
+    def serialize(self, record):
+        name = self._encoded.get(record.name)
+        if name is None:
+            if len(self._encoded) >= MAX_CACHED_NAMES:
+                self._encoded = {}
+            name = self._encoded[record.name] = self.encode_string(record.name)
+        level = self._encoded.get(record.levelname)
+        if level is None:
+            level = self._encoded[record.levelname] = self.encode_string(record.levelname)
+        nodeid = getattr(record, "_logfest_nodeid", None)
+
+        line = '{"timestamp": %r, "level": %s, "logger": %s, "nodeid": %s, "message": %s' % (
+            record.created, level, name, self.encode_string(nodeid) if nodeid is not None else "null",
+            self.encode_string(record.getMessage()))
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+        if record.exc_text:
+            line += ', "exc_info": %s' % self.encode_string(record.exc_text)
+
+        extra = dict((key, value) for key, value in vars(record).items()
+                     if key not in _LOG_RECORD_ATTRIBUTES and not key.startswith("_logfest"))
+        if extra:
+            line += ', "extra": %s' % json.dumps(extra, sort_keys=True, default=str)
+
+        return line + "}\n"
+
+
+class _RecordQueue(object):
+    """Records with their sequence number in order of arrival, the oldest ones optionally spilled to a temporary file"""
+    def __init__(self):
+        self.records = collections.deque()
+        self.spill_file = None
+        self.spilled = 0
+
+    def __len__(self):
+        return len(self.records) + self.spilled
+
+    def __iter__(self):
+        if self.spilled:
+            self.spill_file.seek(0)
+            for _ in range(self.spilled):
+                yield pickle.load(self.spill_file)
+
+        for sequenced_record in self.records:
+            yield sequenced_record
+
+    def spill(self):
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(prefix="logfest-")
+
+        self.spill_file.seek(0, os.SEEK_END)
+        for sequence, record in self.records:
+            record = _prepare_for_pickling(record)
+            try:
+                pickled_record = pickle.dumps((sequence, record), pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                pickled_record = pickle.dumps((sequence, _replace_unpicklable_attributes(record)),
+                                              pickle.HIGHEST_PROTOCOL)
+            self.spill_file.write(pickled_record)
+        self.spilled += len(self.records)
+        self.records.clear()
+
+    def clear(self):
+        self.records.clear()
+        if self.spilled:
+            self.spill_file.seek(0)
+            self.spill_file.truncate()
+            self.spilled = 0
+
+    def close(self):
+        self.records.clear()
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+            self.spilled = 0
+
+
+def _prepare_for_pickling(record):
+    # same approach as logging.handlers.QueueHandler.prepare: args and exc_info are not necessarily picklable
+    record = copy.copy(record)
+    try:
+        record.msg = record.getMessage()
+        record.args = None
+    except Exception:
+        pass  # reported as a logging error by the handler that formats the record, as without spilling
+    if record.exc_info:
+        if not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+    return record
+
+
+def _replace_unpicklable_attributes(record):
+    """Replaces the attributes of a record that cannot be pickled, like a lock passed in extra, by their repr"""
+    for name, value in list(record.__dict__.items()):
+        try:
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            setattr(record, name, repr(value))
+    return record
+
+
+def _dropped_records_record(dropped, first_kept_record):
+    """Returns the INFO record with the number of records a buffer dropped, at the node and time of the first kept"""
+    return logging.makeLogRecord({
+        "name": first_kept_record.name,
+        "levelno": logging.INFO,
+        "levelname": logging.getLevelName(logging.INFO),
+        "msg": "Logfest dropped %d buffered log record(s) due to buffer limit",
+        "args": (dropped,),
+        "created": first_kept_record.created,
+    })
 
 
 class MyMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler without a size limit when capacity is None, flushing only on flushLevel.
+
+    Records are buffered in two queues: INFO and higher, and below INFO. flush hands all records to the target in
+    order of arrival, flush_with_filter_on_info only the INFO and higher queue. Both clear the two queues.
+
+    The buffer can be bounded with max_records and/or max_bytes (size of the formatted message). When a bound is
+    exceeded, the oldest DEBUG records are dropped, the oldest INFO and higher records only when no DEBUG records are
+    left. The number of dropped records is written to the target as one INFO record on the next flush, after which the
+    counter is reset.
+
+    Alternatively, with spill_threshold the buffer moves its records to temporary files once it holds that many
+    records in memory. On flush the temporary files are replayed to the target along with the records still in memory,
+    and then truncated.
+    """
     def __init__(self, *args, **kwargs):
+        self.max_records = kwargs.pop("max_records", None)
+        self.max_bytes = kwargs.pop("max_bytes", None)
+        self.spill_threshold = kwargs.pop("spill_threshold", None)
         super(MyMemoryHandler, self).__init__(*args, **kwargs)
+        self.buffer = None  # replaced by info_queue and debug_queue
+        self.info_queue = _RecordQueue()
+        self.debug_queue = _RecordQueue()
+        self.sequence = itertools.count()
+        self.buffered_bytes = 0
+        self.dropped = 0
 
     def shouldFlush(self, record):
         if self.capacity is None:
             return record.levelno >= self.flushLevel
         else:
-            return super(MyMemoryHandler, self).shouldFlush(record)
+            return len(self.info_queue) + len(self.debug_queue) >= self.capacity or \
+                record.levelno >= self.flushLevel
+
+    def emit(self, record):
+        try:
+            queue_for_record = self.info_queue if record.levelno >= logging.INFO else self.debug_queue
+            queue_for_record.records.append((next(self.sequence), record))
+            if self.max_bytes is not None:
+                self.buffered_bytes += self._record_size(record)
+            self._drop_oldest_records()
+
+            if self.shouldFlush(record):
+                self.flush()
+            elif self.spill_threshold is not None and \
+                    len(self.info_queue.records) + len(self.debug_queue.records) >= self.spill_threshold:
+                self.info_queue.spill()
+                self.debug_queue.spill()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target:
+                # sequence numbers are unique, so the (sequence, record) tuples never compare the records themselves
+                self._hand_over(heapq.merge(self.info_queue, self.debug_queue))
+        finally:
+            self.release()
 
     def flush_with_filter_on_info(self):
-        filter_on_info = FilterOnLogLevel(logging.INFO)
+        self.acquire()
+        try:
+            if self.target:
+                self._hand_over(iter(self.info_queue))
+        finally:
+            self.release()
 
-        if self.target:
-            self.target.addFilter(filter_on_info)
-            self.flush()
-            self.target.removeFilter(filter_on_info)
+    def close(self):
+        try:
+            super(MyMemoryHandler, self).close()
+        finally:
+            self.info_queue.close()
+            self.debug_queue.close()
+
+    def _hand_over(self, sequenced_records):
+        first_sequenced_record = next(sequenced_records, None)
+        if first_sequenced_record is not None:
+            if self.dropped:
+                self.target.handle(_dropped_records_record(self.dropped, first_sequenced_record[1]))
+
+            self.target.handle(first_sequenced_record[1])
+            for _, record in sequenced_records:
+                self.target.handle(record)
+
+        self.info_queue.clear()
+        self.debug_queue.clear()
+        self.buffered_bytes = 0
+        self.dropped = 0
+
+    def _drop_oldest_records(self):
+        while len(self.info_queue.records) + len(self.debug_queue.records) > 1 and self._limit_exceeded():
+            # DEBUG records go first, they are not written when the buffer is flushed with filter on INFO anyway
+            if self.debug_queue.records:
+                _, dropped_record = self.debug_queue.records.popleft()
+            else:
+                _, dropped_record = self.info_queue.records.popleft()
+
+            if self.max_bytes is not None:
+                self.buffered_bytes -= self._record_size(dropped_record)
+            self.dropped += 1
+
+    def _limit_exceeded(self):
+        if self.max_records is not None and len(self.info_queue) + len(self.debug_queue) > self.max_records:
+            return True
+        if self.max_bytes is not None and self.buffered_bytes > self.max_bytes:
+            return True
+        return False
+
+    @staticmethod
+    def _record_size(record):
+        try:
+            return record._logfest_size
+        except AttributeError:
+            try:
+                record._logfest_size = len(record.getMessage())
+            except Exception:  # reported as a logging error by the handler that formats the record
+                record._logfest_size = len(str(record.msg))
+            return record._logfest_size
+
+
+class FailureBufferHandler(logging.Handler):
+    """
+    Keeps all records of a test in memory, to write them to file only if the test fails. If there are more than
+    max_records records, the oldest ones are dropped and the number of dropped records is written first.
+    """
+    def __init__(self, max_records=None):
+        super(FailureBufferHandler, self).__init__()
+        self.records = collections.deque(maxlen=max_records)
+        self.dropped = 0
+
+    def emit(self, record):
+        if self.records.maxlen is not None and len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+
+    def write_to(self, handler):
+        if self.dropped:
+            handler.handle(_dropped_records_record(self.dropped, self.records[0]))
+
+        for record in self.records:
+            handler.handle(record)
+
+
+class LogWriterThread(object):
+    """
+    Single background thread that lets the target handlers of AsyncHandlers format and write their records.
+
+    With overflow "block" a full queue blocks the logging thread, with overflow "drop" the record is dropped and
+    counted. Calls like committing or closing a target handler and stopping the thread are never dropped.
+    """
+    _stop = object()
+
+    def __init__(self, queue_size=0, overflow="block"):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflow = overflow
+        self.dropped = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="logfest-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self.queue.put(self._stop)
+            self._thread.join()
+            self._thread = None
+
+    def enqueue(self, handler, record):
+        if self.overflow == "drop":
+            try:
+                self.queue.put_nowait((handler, record))
+            except queue.Full:
+                self.dropped += 1
         else:
-            self.flush()
+            self.queue.put((handler, record))
+
+    def enqueue_call(self, handler, method_name):
+        self.queue.put((handler, method_name))
+
+    def drain(self):
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is self._stop:
+                    return
+
+                handler, record_or_method_name = item
+                if isinstance(record_or_method_name, logging.LogRecord):
+                    handler.handle(record_or_method_name)
+                else:
+                    try:
+                        getattr(handler, record_or_method_name)()
+                    except Exception:
+                        traceback.print_exc()
+            finally:
+                self.queue.task_done()
+
+
+class AsyncHandler(logging.Handler):
+    """Passes records to a LogWriterThread, so the target handler formats and writes them on the writer thread"""
+    def __init__(self, target, writer):
+        self.target = target
+        self.writer = writer
+        super(AsyncHandler, self).__init__(level=target.level)
+
+    @property
+    def baseFilename(self):
+        return self.target.baseFilename
+
+    @property
+    def segment_base(self):
+        return self.target.segment_base
+
+    def emit(self, record):
+        self.writer.enqueue(self.target, record)
+
+    def tell(self):
+        self.writer.drain()
+        return self.target.tell()
+
+    def commit(self):
+        self.writer.enqueue_call(self.target, "commit")
+
+    def rotate_if_due(self):
+        self.writer.enqueue_call(self.target, "rotate_if_due")
+
+    def close(self):
+        self.writer.enqueue_call(self.target, "close")
+        super(AsyncHandler, self).close()
+
+
+class SQLiteHandler(logging.Handler):
+    """
+    Collects records and inserts them into a SQLite database, one executemany per commit, on a writer thread.
+
+    Every record is stored with the session, the nodeid of the current test (if any), the logger name, level, time
+    and message. The database is in WAL mode and indexed on nodeid, level, logger and time.
+    """
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, session TEXT, nodeid TEXT, logger TEXT, "
+        "level INTEGER, levelname TEXT, created REAL, message TEXT)",
+        "CREATE INDEX IF NOT EXISTS records_nodeid ON records (nodeid)",
+        "CREATE INDEX IF NOT EXISTS records_level ON records (level)",
+        "CREATE INDEX IF NOT EXISTS records_logger ON records (logger)",
+        "CREATE INDEX IF NOT EXISTS records_created ON records (created)",
+    ]
+    INSERT = "INSERT INTO records (session, nodeid, logger, level, levelname, created, message) " \
+             "VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+    _stop = object()
+
+    def __init__(self, path_to_database, session):
+        super(SQLiteHandler, self).__init__()
+        self.path_to_database = path_to_database
+        self.session = session
+        self.nodeid = None
+        self._batch = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="logfest-sqlite-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            self._batch.append((self.session, self.nodeid, record.name, record.levelno, record.levelname,
+                                record.created, message))
+        except Exception:
+            self.handleError(record)
+
+    def commit(self):
+        self.acquire()
+        try:
+            if self._batch:
+                self._queue.put(self._batch)
+                self._batch = []
+        finally:
+            self.release()
+
+    def rotate_if_due(self):
+        """The database is shared by all sessions, it is never rotated"""
+
+    def close(self):
+        self.commit()
+        if self._thread is not None:
+            self._queue.put(self._stop)
+            self._thread.join()
+            self._thread = None
+        super(SQLiteHandler, self).close()
+
+    def _run(self):
+        connection = sqlite3.connect(self.path_to_database, timeout=60)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+
+            while True:
+                batch = self._queue.get()
+                if batch is self._stop:
+                    return
+
+                try:
+                    with connection:
+                        connection.executemany(self.INSERT, batch)
+                except sqlite3.Error:
+                    traceback.print_exc()
+        finally:
+            connection.close()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import json
+import marshal
+import re
+
+from pytest_logfest import binary_format
+from pytest_logfest.compression import open_log_file, split_compression_suffix
+
+RECORD_START = re.compile(r"^\d{2}:\d{2}:\d{2} ")
+
+
+def read_log_records(path_to_file):
+    """Yields the log records in a log file, including continuation lines like tracebacks, one record at a time"""
+    with open_log_file(path_to_file, "r", errors="replace") as log_file:
+        record = []
+        for line in log_file:
+            if RECORD_START.match(line) and record:
+                yield "".join(record)
+                record = []
+            record.append(line)
+
+        if record:
+            yield "".join(record)
+
+
+def merge_log_files(paths_to_files, path_to_merged_file):
+    """
+    Merges log files into one file ordered by the time of the log records, reading one record per file at a time.
+
+    Log records from different files with the same time keep the order of paths_to_files, log records from the same
+    file always keep their order. Text log files are ordered by the time in their lines, which is in seconds and has no
+    date: a time earlier than the previous one in the same file is taken to be on the next day. Text log files that
+    start on different sides of midnight are therefore not merged in order.
+    """
+    if split_compression_suffix(path_to_merged_file)[0].endswith(binary_format.SUFFIX):
+        _merge_binary_log_files(paths_to_files, path_to_merged_file)
+        return
+    if split_compression_suffix(path_to_merged_file)[0].endswith(".jsonl"):
+        _merge_json_lines_log_files(paths_to_files, path_to_merged_file)
+        return
+
+    log_records = [_read_text_log_records(path_to_file, index) for index, path_to_file in enumerate(paths_to_files)]
+
+    with open_log_file(path_to_merged_file, "a") as merged_file:
+        for _, _, record in heapq.merge(*log_records):
+            merged_file.write(record)
+
+
+# heapq.merge has no key argument before Python 3.5, so the readers below yield (key, index, record) tuples: the index
+# of the file breaks ties between files, so the records themselves are never compared
+
+
+def _read_text_log_records(path_to_file, index):
+    days = 0
+    previous_time = None
+    for record in read_log_records(path_to_file):
+        time = record[:8]
+        if previous_time is not None and time < previous_time:
+            days += 1
+        previous_time = time
+        yield (days, time), index, record
+
+
+def _read_json_lines_log_records(path_to_file, index):
+    with open_log_file(path_to_file, "r") as log_file:
+        for line in log_file:
+            yield json.loads(line)["timestamp"], index, line
+
+
+def _merge_json_lines_log_files(paths_to_files, path_to_merged_file):
+    log_records = [_read_json_lines_log_records(path_to_file, index)
+                   for index, path_to_file in enumerate(paths_to_files)]
+
+    with open_log_file(path_to_merged_file, "a") as merged_file:
+        for _, _, line in heapq.merge(*log_records):
+            merged_file.write(line)
+
+
+def _read_binary_log_records(path_to_file, index):
+    with open_log_file(path_to_file, "rb") as binary_file:
+        for frame in binary_format.read_frames(binary_file):
+            yield frame[0], index, frame
+
+
+def _merge_binary_log_files(paths_to_files, path_to_merged_file):
+    log_records = [_read_binary_log_records(path_to_file, index) for index, path_to_file in enumerate(paths_to_files)]
+    encoder = binary_format.BinaryRecordEncoder()
+
+    with open_log_file(path_to_merged_file, "ab") as merged_file:
+        merged_file.write(binary_format.MAGIC)
+        for _, _, (created_us, levelno, name, msg, args) in heapq.merge(*log_records):
+            merged_file.write(encoder.encode_fields(created_us, levelno, name, marshal.dumps((msg, args))))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only file stream that writes into a memory-mapped region, for logfest-writer=mmap.
+
+The file is grown in chunks of chunk_size bytes, so most writes are a copy into the mapped region instead of a write
+syscall. The disk space of every chunk is allocated up front with posix_fallocate where available, so a full disk
+raises OSError when growing instead of SIGBUS when writing into the mapped region. Until the stream is closed the file
+is larger than its content, the rest is filled with zero bytes. On close the file is truncated to its content; if the
+process is killed before that, up to chunk_size zero bytes remain at the end of the file.
+"""
+
+import locale
+import mmap
+import os
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _preallocate(fd, offset, length):
+    """Allocates disk space for length bytes from offset, or only extends the file if posix_fallocate is missing"""
+    if length <= 0:
+        return
+
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, offset, length)
+    else:
+        os.ftruncate(fd, offset + length)
+
+
+class MmapAppendStream(object):
+    """
+    Stream appending to path_to_file through mmap, with the write, flush, tell, fileno and close of a file object,
+    and sync to make sure the written data is on disk.
+    Writes str encoded with encoding (the preferred encoding of the locale if None or 'locale') unless 'b' is in mode.
+    Raises OSError, ValueError or mmap.error if the file cannot be memory-mapped, e.g. on some network filesystems, or
+    if no disk space can be allocated when growing the file.
+    """
+    def __init__(self, path_to_file, mode="a", encoding=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if "b" in mode:
+            self.encoding = None
+        elif encoding is None or encoding == "locale":  # FileHandler sets io.text_encoding(None): 'locale'
+            self.encoding = locale.getpreferredencoding(False)
+        else:
+            self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.mapped = None
+        self.fd = os.open(path_to_file, os.O_RDWR | os.O_CREAT, 0o644)
+        self.length = os.fstat(self.fd).st_size
+        self.capacity = self.length
+        try:
+            self._grow(0)
+        except Exception:
+            try:
+                os.ftruncate(self.fd, self.length)  # undo the preallocation
+            finally:
+                os.close(self.fd)
+            raise
+
+    def _grow(self, needed):
+        """Makes room for needed more bytes, in whole chunks, and maps the whole file again"""
+        capacity = self.capacity
+        while capacity < self.length + needed or capacity == 0:
+            capacity += self.chunk_size
+
+        if capacity != self.capacity or self.mapped is None:
+            _preallocate(self.fd, self.capacity, capacity - self.capacity)
+            if self.mapped is not None:
+                self.mapped.close()
+                self.mapped = None
+            self.capacity = capacity
+            self.mapped = mmap.mmap(self.fd, capacity)
+
+    def write(self, data):
+        if self.encoding is not None:
+            data = data.encode(self.encoding)
+
+        if self.length + len(data) > self.capacity:
+            self._grow(len(data))
+
+        self.mapped[self.length:self.length + len(data)] = data
+        self.length += len(data)
+        return len(data)
+
+    def flush(self):
+        """Nothing to do, written data is in the page cache as soon as it is copied into the mapped region"""
+
+    def tell(self):
+        return self.length
+
+    def fileno(self):
+        return self.fd
+
+    def sync(self):
+        self.mapped.flush()
+        os.fsync(self.fd)
+
+    def close(self):
+        if self.fd is None:
+            return
+
+        try:
+            if self.mapped is not None:
+                self.mapped.close()
+                self.mapped = None
+            os.ftruncate(self.fd, self.length)
+        finally:
+            os.close(self.fd)
+            self.fd = None
@@ -1,24 +1,100 @@
 # -*- coding: utf-8 -*-
 
-import datetime
+import atexit
+import collections
 import errno
 import os
 import logging
-import logging.handlers
+import re
+import shutil
+import sys
+import time
 import pytest
 
-from pytest_logfest.logging_classes import FilterOnExactNodename, MyMemoryHandler
+from pytest_logfest.compression import COMPRESSION_SUFFIXES, check_compression_available, split_compression_suffix
 
-try:
-    from pathlib import Path
-except (ImportError, AttributeError):
-    from pathlib2 import Path
+# Apart from compression, which only imports io, os and shutil, the modules of pytest_logfest are imported where they
+# are used, so the plugin costs next to nothing when logfest is not used in a pytest run.
+
+# the keys of pytest_logfest.postprocess.POSTPROCESSORS, not imported from there to keep postprocess out of startup
+POSTPROCESSOR_NAMES = ("gzip", "warnings")
 
 
 def pytest_addoption(parser):
-    parser.addoption("--logfest", action="store", default="", help="Default: <empty>. Options: quiet, basic, full")
+    parser.addoption("--logfest", action="store", default="",
+                     help="Default: <empty>. Options: quiet, basic, full, failures, sqlite")
+    parser.addoption("--logfest-async", action="store_true", default=False,
+                     help="Format and write log records to file on a background thread.")
+    parser.addoption("--logfest-fsync", action="store_true", default=False,
+                     help="Sync log files to disk at the end of every test.")
+    parser.addoption("--logfest-compress", action="store", default=None, choices=sorted(COMPRESSION_SUFFIXES),
+                     help="Compress log files. zstd requires the zstandard package.")
+    parser.addoption("--logfest-format", action="store", default="text", choices=["text", "binary", "jsonl"],
+                     help="Default: text. binary writes unformatted records, render them with logfest-render. "
+                          "jsonl writes one JSON object per record.")
+    parser.addoption("--logfest-index", action="store_true", default=False,
+                     help="Write an index with the location of the log of every test in the log files.")
+    parser.addoption("--logfest-stats", action="store_true", default=False,
+                     help="Count log records, bytes and time spent writing log files per test.")
+    parser.addoption("--logfest-postprocess", action="append", default=None, choices=POSTPROCESSOR_NAMES,
+                     help="Post-process the log files at the end of the session, in parallel. warnings: write the "
+                          "WARNING and higher records to a .warnings file, gzip: compress. Can be repeated.")
 
     parser.addini("logfest-root-node", "root log node of logfest plugin", default=None)
+    parser.addini("logfest-buffer-max-records",
+                  "maximum number of log records buffered for the basic log file; oldest records are dropped first",
+                  default=None)
+    parser.addini("logfest-buffer-max-bytes",
+                  "maximum size in bytes of the log messages buffered for the basic log file; "
+                  "oldest records are dropped first", default=None)
+    parser.addini("logfest-buffer-spill-threshold",
+                  "number of log records buffered in memory for the basic log file before they are moved to a "
+                  "temporary file", default=None)
+    parser.addini("logfest-async-queue-size",
+                  "maximum number of log records waiting for the background writer thread, 0 is unlimited", default=0)
+    parser.addini("logfest-async-overflow",
+                  "what to do when the queue of the background writer thread is full: block or drop", default="block")
+    parser.addini("logfest-write-buffer-size",
+                  "number of bytes of log records collected before writing them to file, 0 writes every record",
+                  default=0)
+    parser.addini("logfest-write-buffer-seconds",
+                  "maximum number of seconds log records are collected before writing them to file", default=None)
+    parser.addini("logfest-writer",
+                  "how log files are written: stream (regular file) or mmap (memory-mapped, grown in chunks)",
+                  default="stream")
+    parser.addini("logfest-mmap-chunk-size", "number of bytes log files are grown by with logfest-writer=mmap",
+                  default=None)
+    parser.addini("logfest-module-handler-pool-size",
+                  "number of module-level full log files kept open after module teardown, for modules that are "
+                  "set up again later in the session", default=0)
+    parser.addini("logfest-failures-max-records",
+                  "maximum number of log records of a test kept for its log file with --logfest=failures; "
+                  "oldest records are dropped first", default=10000)
+    parser.addini("logfest-rotate-max-bytes",
+                  "size in bytes after which a log file continues in a new segment, checked between tests",
+                  default=None)
+    parser.addini("logfest-rotate-seconds",
+                  "number of seconds after which a log file continues in a new segment, checked between tests",
+                  default=None)
+    parser.addini("logfest-rotate-backup-count",
+                  "number of rotated segments kept per log file, the oldest are removed; all are kept by default",
+                  default=None)
+    parser.addini("logfest-rotate-compress", "gzip-compress rotated segments of log files on a background thread",
+                  type="bool", default=False)
+    parser.addini("logfest-function-logger-pool-size",
+                  "number of function-level loggers kept for reuse; if set, function-level loggers are not registered "
+                  "with logging, so they are not kept for the rest of the session", default=0)
+    parser.addini("logfest-collapse-duplicates",
+                  "collapse consecutive log records of a logger with the same level and message", type="bool",
+                  default=False)
+    parser.addini("logfest-rate-limit", "maximum number of log records below WARNING per second per logger",
+                  default=None)
+    parser.addini("logfest-rate-limit-burst",
+                  "number of log records a logger can log at once before the rate limit applies, "
+                  "defaults to logfest-rate-limit", default=None)
+    parser.addini("logfest-postprocess-jobs",
+                  "number of log files post-processed in parallel, defaults to the number of CPUs", default=None)
+    parser.addini("logfest-stats-top", "number of tests shown in the terminal summary of --logfest-stats", default=10)
 
 
 def pytest_report_header(config):
@@ -35,6 +111,10 @@ def pytest_runtest_makereport(item, call):
 
     setattr(item, "rep_" + rep.when, rep)
 
+    stats = item.config._logfest_stats
+    if stats is not None:
+        stats.add_duration(item.nodeid, rep.duration)
+
 
 def pytest_addhooks(pluginmanager):
     from . import hooks
@@ -43,10 +123,107 @@ def pytest_addhooks(pluginmanager):
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
-    config._timestamp = datetime.datetime.now().strftime('%Y%m%d-%H-%M-%S')
+    if _xdist_worker_id(config):
+        config._timestamp = config.workerinput["logfest_timestamp"]
+    else:
+        config._timestamp = time.strftime('%Y%m%d-%H-%M-%S')
+
+    if config.getoption("logfest_compress"):
+        try:
+            check_compression_available(config.getoption("logfest_compress"))
+        except ImportError as exc:
+            raise pytest.UsageError("--logfest-compress=%s is not available: %s"
+                                    % (config.getoption("logfest_compress"), exc))
+
+    if config.getoption("logfest_index") and \
+            (config.getoption("logfest_compress") or config.getoption("logfest_format") == "binary"):
+        raise pytest.UsageError("--logfest-index only supports uncompressed log files in text or jsonl format")
+
+    config._logfest_file_handlers = []
+    config._logfest_index = None
+    config._logfest_sqlite_handler = None
+    config._logfest_stats = None
+    if config.getoption("logfest_stats"):
+        from pytest_logfest.stats import LogStats
+        config._logfest_stats = LogStats()
+    config._logfest_module_handler_pool = collections.OrderedDict()
+    config._logfest_limiter = _create_record_limiter(config)
+    config._logfest_created_dirs = set()
+    config._logfest_formatter = None
+    config._logfest_dispatcher = None
+    config._logfest_function_logger_pool = []
+
+    config._logfest_writer = None
+    if config.getoption("logfest_async"):
+        overflow = config.getini("logfest-async-overflow")
+        if overflow not in ["block", "drop"]:
+            raise pytest.UsageError("logfest-async-overflow should be block or drop, got: %s" % overflow)
+
+        from pytest_logfest.logging_classes import LogWriterThread
+
+        config._logfest_writer = LogWriterThread(queue_size=_getini_int(config, "logfest-async-queue-size") or 0,
+                                                 overflow=overflow)
+        config._logfest_writer.start()
+        atexit.register(config._logfest_writer.stop)  # in case pytest_unconfigure is never reached
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """pytest-xdist: shares the timestamp of the controller with the workers"""
+    node.workerinput["logfest_timestamp"] = node.config._timestamp
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """pytest-xdist: merges the basic log file shards of the workers, after the workers have finished"""
+    config = session.config
+    shards_dir = _xdist_shards_dir(config)
+    if _xdist_worker_id(config) or not os.path.isdir(shards_dir):
+        return
+
+    from pytest_logfest.merging import merge_log_files
+
+    shards = sorted(os.path.join(shards_dir, shard) for shard in os.listdir(shards_dir))
+    merge_log_files(shards, './artifacts/%s' % _basic_session_filename(config))
+    shutil.rmtree(shards_dir)
+
+
+def pytest_terminal_summary(terminalreporter):
+    writer = terminalreporter.config._logfest_writer
+    if writer is not None and writer.dropped:
+        terminalreporter.write_line("Logfest: dropped %d log record(s) because the writer queue was full"
+                                    % writer.dropped)
+
+    stats = terminalreporter.config._logfest_stats
+    if stats is not None and stats.tests:
+        terminalreporter.write_sep("=", "logfest: top %s tests by time spent writing log files"
+                                   % _getini_int(terminalreporter.config, "logfest-stats-top"))
+        for nodeid, counters in stats.top_tests(_getini_int(terminalreporter.config, "logfest-stats-top")):
+            terminalreporter.write_line("%8.4fs %8d records %10d bytes  %s" % (
+                counters["format_time"] + counters["write_time"] + counters["flush_time"], counters["records"],
+                counters["bytes"], nodeid))
+
+
+def pytest_unconfigure(config):
+    for file_handler in list(getattr(config, "_logfest_file_handlers", [])):
+        _close_file_handler(config, file_handler)
+    getattr(config, "_logfest_module_handler_pool", {}).clear()
+
+    writer = getattr(config, "_logfest_writer", None)
+    if writer is not None:
+        writer.stop()
+
+    stats = getattr(config, "_logfest_stats", None)
+    if stats is not None and stats.tests:
+        _create_directory_if_it_not_exists('./artifacts')
+        filename_components = ["logfest-stats", config._timestamp] + _xdist_worker_id_component(config)
+        stats.write_json('./artifacts/%s.json' % "-".join(filename_components))
+
+    if config.getoption("logfest") and hasattr(config, "_logfest_file_handlers") and not _xdist_worker_id(config):
+        _postprocess_log_files(config)
 
 
-@pytest.fixture(scope='session', autouse=True)
+@pytest.fixture(scope='session')
 def root_log_node(request):
     """Returns name of the root log node taken either from the .ini file or else from the session node name."""
     if request.config.getini("logfest-root-node"):
@@ -57,134 +234,538 @@ def root_log_node(request):
 
 @pytest.fixture(scope='session')
 def session_filememoryhandler(request):
-    """Returns a FileMemoryHandler that flushes at level WARNING to the target_filehandler"""
-    if request.config.getoption("logfest") in ["basic", "full"]:
-        target_filehandler = _create_basic_session_filehandler(request)
-    else:
-        target_filehandler = logging.NullHandler()
+    """
+    Returns a FileMemoryHandler that flushes at level WARNING to the target_filehandler.
+    Returns None if no basic log file is written, so no log records are buffered in vain.
+    """
+    if request.config.getoption("logfest") not in ["basic", "full", "failures", "sqlite"]:
+        return None
+
+    target_filehandler = _create_basic_session_filehandler(request)
 
-    file_memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target_filehandler)
+    max_records = _getini_int(request.config, "logfest-buffer-max-records")
+    max_bytes = _getini_int(request.config, "logfest-buffer-max-bytes")
+    spill_threshold = _getini_int(request.config, "logfest-buffer-spill-threshold")
+    if spill_threshold is not None and (max_records is not None or max_bytes is not None):
+        raise pytest.UsageError("logfest-buffer-spill-threshold cannot be combined with "
+                                "logfest-buffer-max-records or logfest-buffer-max-bytes")
+
+    from pytest_logfest.logging_classes import MyMemoryHandler
+
+    file_memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target_filehandler,
+                                          max_records=max_records, max_bytes=max_bytes,
+                                          spill_threshold=spill_threshold)
     return file_memory_handler
 
 
 @pytest.fixture(scope='session', name='session_logger')
 def fxt_session_logger(request, root_log_node, session_filememoryhandler):
     """
-    Yields a logger named {root_log_node} with one or two handlers:
-        - session_filememoryhandler: flushes at level WARNING and flushes with filter after fixture regains control
-        - session_handler_full (optional): writes all log records to session-level file
+    Yields a logger named {root_log_node} with one optional handler, a LogfestDispatcher routing records to:
+        - session_filememoryhandler (optional): flushes at level WARNING and flushes with filter after fixture regains
+          control
+        - session_handler_full (optional): writes the log records of the session logger to session-level file
+        - session_handler_sqlite (optional): inserts all log records into the SQLite database
+    The dispatcher is removed at session teardown, the file handlers are closed at the end of the session.
     """
     logger = logging.getLogger(root_log_node)
-    logger.addHandler(session_filememoryhandler)
+    limiter_filter = _add_record_limiter_filter(request.config, logger)
+
+    dispatcher = None
+    if request.config.getoption("logfest") in ["basic", "full", "failures", "sqlite"]:
+        from pytest_logfest.logging_classes import LogfestDispatcher
+
+        dispatcher = LogfestDispatcher()
+        request.config._logfest_dispatcher = dispatcher
+        logger.addHandler(dispatcher)
+
+    if session_filememoryhandler is not None:
+        dispatcher.add_sink(session_filememoryhandler)
 
     if request.config.getoption("logfest") == "full":
-        session_handler_full = _create_full_session_filehandler(request, root_log_node)
-        logger.addHandler(session_handler_full)
+        # only session-level records, all others go to the module-level file
+        dispatcher.add_sink(_create_full_session_filehandler(request, root_log_node), node=root_log_node, exact=True)
+
+    if request.config.getoption("logfest") == "sqlite":
+        dispatcher.add_sink(_create_sqlite_handler(request, root_log_node))
 
     yield logger
 
-    session_filememoryhandler.flush_with_filter_on_info()
+    _remove_record_limiter_filter(logger, limiter_filter)
+    _flush_with_filter_on_info(session_filememoryhandler)
+    _commit_file_handlers(request.config)
+
+    if dispatcher is not None:
+        logger.removeHandler(dispatcher)
+        request.config._logfest_dispatcher = None
 
 
 @pytest.fixture(scope='module', name='module_logger')
 def fxt_module_logger(request, session_logger, session_filememoryhandler):
     """
-    Yields a logger, child of the session logger and named the path to the module, with one optional handler:
+    Yields a logger, child of the session logger and named the path to the module, with one optional sink:
         - module_logger_full (optional): writes all log records to module- and function-level file
-
+    The optional sink is removed from the dispatcher at module teardown, and closed or returned to the module handler
+    pool.
     """
-    full_path = Path(request.node.name)
-    file_basename = full_path.stem
-    file_path = list(full_path.parents[0].parts)
+    file_path, file_basename = _module_path_components(request.node.name)
 
     logger = session_logger.getChild(".".join(file_path + [file_basename]))
+    limiter_filter = _add_record_limiter_filter(request.config, logger)
 
+    module_logger_full = None
     if request.config.getoption("logfest") == "full":
         module_logger_full = _create_full_module_filehandler(request, file_path, file_basename)
-        logger.addHandler(module_logger_full)
+        request.config._logfest_dispatcher.add_sink(module_logger_full, node=logger.name)
 
     yield logger
 
-    session_filememoryhandler.flush_with_filter_on_info()
+    _remove_record_limiter_filter(logger, limiter_filter)
+    _flush_with_filter_on_info(session_filememoryhandler)
+    _commit_file_handlers(request.config)
+    _rotate_file_handlers(request.config)
+
+    if module_logger_full is not None:
+        request.config._logfest_dispatcher.remove_sink(module_logger_full)
+        _release_full_module_filehandler(request.config, module_logger_full)
 
 
 @pytest.fixture(scope='function', name='function_logger')
 def fxt_function_logger(request, module_logger, session_filememoryhandler):
     """
-    Yields a logger, child of the module logger and named the name of the function.
-    Adds records for test started, setup error, test fail, and test ended.
-
+    Yields a logger, child of the module logger and named the name of the function. With
+    logfest-function-logger-pool-size, the logger is reused from a pool instead of registered with logging.
+    Adds records for test started, setup error, test fail, and test ended. If log records of the test were collapsed or
+    rate limited, the test ended record says how many.
+    With --logfest=failures, keeps all log records of the test in memory and writes them to a log file for the test
+    if it failed or had a setup error.
+    With --logfest-index, adds the location of the log of the test in the log files to the index.
     """
-    logger = module_logger.getChild(request.node.name)
+    logger = _acquire_function_logger(request.config, module_logger, request.node.name)
+    limiter_filter = _add_record_limiter_filter(request.config, logger)
+    limiter = request.config._logfest_limiter
+    if limiter is not None:
+        limiter.reset()
+
+    indexed_file_handlers = _indexed_file_handlers(request.config, module_logger, session_filememoryhandler)
+    start_offsets = [file_handler.tell() for file_handler in indexed_file_handlers]
+
+    dispatcher = request.config._logfest_dispatcher
+    if dispatcher is not None:
+        dispatcher.nodeid = request.node.nodeid
+
+    failure_buffer = None
+    if request.config.getoption("logfest") == "failures":
+        from pytest_logfest.logging_classes import FailureBufferHandler
+
+        failure_buffer = FailureBufferHandler(_getini_int(request.config, "logfest-failures-max-records"))
+        dispatcher.add_sink(failure_buffer)
+
+    sqlite_handler = request.config._logfest_sqlite_handler
+    if sqlite_handler is not None:
+        sqlite_handler.nodeid = request.node.nodeid
+
+    stats = request.config._logfest_stats
+    if stats is not None:
+        stats.current_nodeid = request.node.nodeid
 
-    logger.info("TEST STARTED")
+    logger.info("TEST STARTED", extra={"_logfest_unlimited": True})
 
     yield logger
 
+    outcome = "passed"
     try:
         if request.node.rep_setup.failed:
             logger.warning("SETUP ERROR")
+            outcome = "error"
+        elif request.node.rep_setup.skipped:
+            outcome = "skipped"
     except AttributeError:
         pass
 
     try:
         if request.node.rep_call.failed:
             logger.warning("TEST FAIL")
+            outcome = "failed"
+        elif request.node.rep_call.skipped:
+            outcome = "skipped"
     except AttributeError:
         pass
 
-    logger.info("TEST ENDED\n")
+    _remove_record_limiter_filter(logger, limiter_filter)
+    if limiter is not None and (limiter.collapsed or limiter.rate_limited):
+        logger.info("TEST ENDED (%d duplicate log record(s) collapsed, %d log record(s) rate limited)\n",
+                    limiter.collapsed, limiter.rate_limited, extra={"outcome": outcome})
+    else:
+        logger.info("TEST ENDED\n", extra={"outcome": outcome})
+
+    if failure_buffer is not None:
+        dispatcher.remove_sink(failure_buffer)
+        if outcome in ["failed", "error"]:
+            _write_failure_log_file(request, failure_buffer)
+
+    _flush_with_filter_on_info(session_filememoryhandler)
+    _commit_file_handlers(request.config)
+
+    if dispatcher is not None:
+        dispatcher.nodeid = None
+    if sqlite_handler is not None:
+        sqlite_handler.nodeid = None
+    if stats is not None:
+        stats.current_nodeid = None
 
-    session_filememoryhandler.flush_with_filter_on_info()
+    for file_handler, start_offset in zip(indexed_file_handlers, start_offsets):
+        _log_index(request.config).add(request.node.nodeid, file_handler.baseFilename, start_offset,
+                                       file_handler.tell() - start_offset, outcome)
 
+    _rotate_file_handlers(request.config)
+    _release_function_logger(request.config, logger)
 
-def _create_logging_file_handler(path_to_file, delay=False):
-    file_handler = logging.FileHandler(path_to_file, mode='a', delay=delay)
+
+def _acquire_function_logger(config, module_logger, name):
+    """
+    Returns the child logger of module_logger named name. With logfest-function-logger-pool-size, returns a
+    PooledLogger from the pool, or a new one if the pool is empty, instead of a logger registered with logging.
+    """
+    if not _getini_int(config, "logfest-function-logger-pool-size"):
+        return module_logger.getChild(name)
+
+    from pytest_logfest.logging_classes import PooledLogger
+
+    pool = config._logfest_function_logger_pool
+    logger = pool.pop() if pool else PooledLogger(name)
+    logger.name = "%s.%s" % (module_logger.name, name)
+    logger.parent = module_logger
+    return logger
+
+
+def _release_function_logger(config, logger):
+    """Resets a PooledLogger and returns it to the pool, unless the pool is full"""
+    pool_size = _getini_int(config, "logfest-function-logger-pool-size")
+    if not pool_size:
+        return
+
+    from pytest_logfest.logging_classes import PooledLogger
+
+    pool = config._logfest_function_logger_pool
+    if isinstance(logger, PooledLogger) and len(pool) < pool_size:
+        logger.level = logging.NOTSET
+        logger.handlers = []
+        logger.filters = []
+        logger.propagate = True
+        logger.disabled = False
+        pool.append(logger)
+
+
+def _flush_with_filter_on_info(session_filememoryhandler):
+    if session_filememoryhandler is not None:
+        session_filememoryhandler.flush_with_filter_on_info()
+
+
+def _create_record_limiter(config):
+    """Returns the RecordLimiter configured in the ini file, or None if duplicates are not collapsed nor rate limited"""
+    rate = config.getini("logfest-rate-limit")
+    try:
+        rate = float(rate) if rate else None
+    except ValueError:
+        raise pytest.UsageError("logfest-rate-limit should be a number, got: %s" % rate)
+    burst = _getini_int(config, "logfest-rate-limit-burst")
+
+    if not config.getini("logfest-collapse-duplicates") and rate is None:
+        return None
+
+    from pytest_logfest.logging_classes import RecordLimiter
+
+    return RecordLimiter(collapse_duplicates=config.getini("logfest-collapse-duplicates"), rate=rate, burst=burst)
+
+
+def _add_record_limiter_filter(config, logger):
+    if config._logfest_limiter is None:
+        return None
+
+    from pytest_logfest.logging_classes import RecordLimiterFilter
+
+    limiter_filter = RecordLimiterFilter(config._logfest_limiter, logger)
+    logger.addFilter(limiter_filter)
+    return limiter_filter
+
+
+def _remove_record_limiter_filter(logger, limiter_filter):
+    """Logs how often the last record was repeated, if it was, and removes the filter"""
+    if limiter_filter is not None:
+        limiter_filter.flush()
+        logger.removeFilter(limiter_filter)
+
+
+def _create_logging_file_handler(config, path_to_file, delay=False):
+    buffer_seconds = config.getini("logfest-write-buffer-seconds")
+    try:
+        buffer_seconds = float(buffer_seconds) if buffer_seconds else None
+    except ValueError:
+        raise pytest.UsageError("logfest-write-buffer-seconds should be a number, got: %s" % buffer_seconds)
+
+    rotate_seconds = config.getini("logfest-rotate-seconds")
+    try:
+        rotate_seconds = float(rotate_seconds) if rotate_seconds else None
+    except ValueError:
+        raise pytest.UsageError("logfest-rotate-seconds should be a number, got: %s" % rotate_seconds)
+
+    writer = config.getini("logfest-writer")
+    if writer not in ["stream", "mmap"]:
+        raise pytest.UsageError("logfest-writer should be stream or mmap, got: %s" % writer)
+
+    from pytest_logfest.logging_classes import AsyncHandler, BinaryFileHandler, JsonLinesFileHandler, \
+        LogfestFileHandler, LogfestFormatter
+    from pytest_logfest.mmap_writer import DEFAULT_CHUNK_SIZE
+
+    if config.getoption("logfest_format") == "binary":
+        handler_class = BinaryFileHandler
+    elif config.getoption("logfest_format") == "jsonl":
+        handler_class = JsonLinesFileHandler
+    else:
+        handler_class = LogfestFileHandler
+
+    file_handler = handler_class(path_to_file, delay=delay,
+                                 buffer_size=_getini_int(config, "logfest-write-buffer-size") or 0,
+                                 buffer_seconds=buffer_seconds,
+                                 fsync=config.getoption("logfest_fsync"),
+                                 compression=config.getoption("logfest_compress"),
+                                 stats=config._logfest_stats,
+                                 created_dirs=config._logfest_created_dirs,
+                                 rotate_bytes=_getini_int(config, "logfest-rotate-max-bytes"),
+                                 rotate_seconds=rotate_seconds,
+                                 rotate_backups=_getini_int(config, "logfest-rotate-backup-count"),
+                                 rotate_compress=config.getini("logfest-rotate-compress"),
+                                 writer=writer,
+                                 mmap_chunk_size=_getini_int(config, "logfest-mmap-chunk-size") or DEFAULT_CHUNK_SIZE)
     file_handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s %(levelname)s - %(name)s - %(message)s', "%H:%M:%S")
-    file_handler.setFormatter(formatter)
+    if config._logfest_formatter is None:
+        config._logfest_formatter = LogfestFormatter()
+    file_handler.setFormatter(config._logfest_formatter)
+
+    if config._logfest_writer is not None:
+        file_handler = AsyncHandler(file_handler, config._logfest_writer)
 
+    config._logfest_file_handlers.append(file_handler)
     return file_handler
 
 
+def _commit_file_handlers(config):
+    """Writes collected log records to file, and syncs them to disk if --logfest-fsync is set"""
+    for file_handler in config._logfest_file_handlers:
+        file_handler.commit()
+
+
+def _rotate_file_handlers(config):
+    """Continues log files in a new segment if they are due, between tests so the log of a test is in one segment"""
+    for file_handler in config._logfest_file_handlers:
+        file_handler.rotate_if_due()
+
+
+def _basic_session_filename_components(config):
+    filename_components = ["session", config._timestamp]
+    config.hook.pytest_logfest_log_file_name_basic(filename_components=filename_components)
+    return filename_components
+
+
+def _basic_session_filename(config):
+    return "-".join(_basic_session_filename_components(config)) + _log_file_suffix(config)
+
+
+def _log_index(config):
+    """Returns the index writer, the index is named after the basic log file"""
+    if config._logfest_index is None:
+        _create_directory_if_it_not_exists('./artifacts')
+        filename = "-".join(_basic_session_filename_components(config)) + ".index.jsonl"
+        from pytest_logfest.index import LogIndexWriter
+
+        config._logfest_index = LogIndexWriter('./artifacts/%s' % filename)
+    return config._logfest_index
+
+
+def _indexed_file_handlers(config, module_logger, session_filememoryhandler):
+    """
+    Returns the module-level full log file handler and the basic log file handler if --logfest-index is set.
+    With pytest-xdist the basic log file is merged at the end of the session, so its offsets are not known.
+    """
+    if not config.getoption("logfest_index") or config._logfest_dispatcher is None:
+        return []
+
+    file_handlers = [file_handler for file_handler in config._logfest_dispatcher.sinks_of(module_logger.name)
+                     if file_handler in config._logfest_file_handlers]
+    if session_filememoryhandler is not None and not _xdist_worker_id(config):
+        file_handlers.append(session_filememoryhandler.target)
+    return file_handlers
+
+
 def _create_basic_session_filehandler(request):
-    filename_components = ["session", request.config._timestamp]
-    request.config.hook.pytest_logfest_log_file_name_basic(filename_components=filename_components)
-    filename = "-".join(filename_components) + ".log"
+    filename = _basic_session_filename(request.config)
 
-    _create_directory_if_it_not_exists('./artifacts')
+    worker_id = _xdist_worker_id(request.config)
+    if worker_id:
+        # each worker writes its own shard, which are merged into the basic log file at the end of the session
+        log_dir = _xdist_shards_dir(request.config)
+        filename = "%s-%s" % (worker_id, filename)
+    else:
+        log_dir = './artifacts'
 
-    file_handler = _create_logging_file_handler('./artifacts/%s' % filename)
+    file_handler = _create_logging_file_handler(request.config, '%s/%s' % (log_dir, filename), delay=True)
 
     return file_handler
 
 
 def _create_full_session_filehandler(request, root_log_node):
-    filename_components = [root_log_node, request.config._timestamp]
+    filename_components = [root_log_node, request.config._timestamp] + _xdist_worker_id_component(request.config)
     request.config.hook.pytest_logfest_log_file_name_full_session(filename_components=filename_components)
-    filename = "-".join(filename_components) + ".log"
+    filename = "-".join(filename_components) + _log_file_suffix(request.config)
 
-    file_handler = _create_logging_file_handler('./artifacts/%s' % filename, delay=True)
-
-    filter = FilterOnExactNodename(root_log_node)  # only session-level records, all others go to module filehandler
-    file_handler.addFilter(filter)
+    file_handler = _create_logging_file_handler(request.config, './artifacts/%s' % filename, delay=True)
 
     return file_handler
 
 
+def _create_sqlite_handler(request, root_log_node):
+    """Returns a handler inserting log records into ./artifacts/logfest.sqlite, shared by all sessions"""
+    _create_directory_if_it_not_exists('./artifacts')
+
+    from pytest_logfest.logging_classes import SQLiteHandler
+
+    sqlite_handler = SQLiteHandler('./artifacts/logfest.sqlite', "%s-%s" % (root_log_node, request.config._timestamp))
+    sqlite_handler.setLevel(logging.DEBUG)
+
+    request.config._logfest_sqlite_handler = sqlite_handler
+    request.config._logfest_file_handlers.append(sqlite_handler)
+    return sqlite_handler
+
+
 def _create_full_module_filehandler(request, file_path, file_basename):
     log_dir = "./artifacts/" + os.path.sep.join(file_path)
-    _create_directory_if_it_not_exists(log_dir)
 
-    filename_components = [file_basename, request.config._timestamp]
+    filename_components = [file_basename, request.config._timestamp] + _xdist_worker_id_component(request.config)
     request.config.hook.pytest_logfest_log_file_name_full_module(filename_components=filename_components)
-    filename = "-".join(filename_components) + ".log"
+    filename = "-".join(filename_components) + _log_file_suffix(request.config)
+    path_to_file = '%s/%s' % (log_dir, filename)
+
+    pool = request.config._logfest_module_handler_pool
+    if os.path.abspath(path_to_file) in pool:
+        return pool.pop(os.path.abspath(path_to_file))
 
-    file_handler = _create_logging_file_handler('%s/%s' % (log_dir, filename), delay=True)
+    file_handler = _create_logging_file_handler(request.config, path_to_file, delay=True)
 
     return file_handler
 
 
+def _write_failure_log_file(request, failure_buffer):
+    """Writes the log records of a failed test to ./artifacts/<path to module>/<module>-<test>-<timestamp>.log"""
+    file_path, file_basename = _module_path_components(request.node.nodeid.split("::")[0])
+    log_dir = "./artifacts/" + os.path.sep.join(file_path)
+
+    test_name = re.sub(r'[\\/:*?"<>|]', "_", request.node.name)
+    filename_components = [file_basename, test_name, request.config._timestamp] + \
+        _xdist_worker_id_component(request.config)
+    filename = "-".join(filename_components) + _log_file_suffix(request.config)
+
+    file_handler = _create_logging_file_handler(request.config, '%s/%s' % (log_dir, filename), delay=True)
+    failure_buffer.write_to(file_handler)
+    _close_file_handler(request.config, file_handler)
+
+
+def _release_full_module_filehandler(config, file_handler):
+    """Closes the file handler, or keeps it open in the module handler pool and closes the least recently used one"""
+    pool = config._logfest_module_handler_pool
+    pool[file_handler.segment_base] = file_handler
+
+    while len(pool) > (_getini_int(config, "logfest-module-handler-pool-size") or 0):
+        _close_file_handler(config, pool.popitem(last=False)[1])
+
+
+def _close_file_handler(config, file_handler):
+    config._logfest_file_handlers.remove(file_handler)
+    file_handler.close()
+
+
+def _postprocess_log_files(config):
+    """Runs the post-processors of --logfest-postprocess and of plugins on the log files of the session"""
+    from pytest_logfest.postprocess import POSTPROCESSORS, process_files
+
+    chosen = config.getoption("logfest_postprocess") or []
+    processors = [POSTPROCESSORS["warnings"]] if "warnings" in chosen else []
+    config.hook.pytest_logfest_postprocessors(config=config, processors=processors)
+    if "gzip" in chosen:
+        processors.append(POSTPROCESSORS["gzip"])
+
+    if not processors:
+        return
+
+    log_files = _session_log_files(config)
+    if not log_files:
+        return
+
+    for error in process_files(log_files, processors, jobs=_getini_int(config, "logfest-postprocess-jobs")):
+        sys.stderr.write("Logfest: post-processing failed: %s\n" % error)
+
+
+def _session_log_files(config):
+    """Returns the log files of the session in ./artifacts, including rotated segments and those of xdist workers"""
+    log_files = []
+    for directory, _, filenames in os.walk('./artifacts'):
+        for filename in sorted(filenames):
+            path_without_compression = split_compression_suffix(filename)[0]
+            if config._timestamp in filename and path_without_compression.endswith(_log_format_suffix(config)) and \
+                    not path_without_compression.endswith((".index.jsonl", ".warnings" + _log_format_suffix(config))):
+                log_files.append(os.path.join(directory, filename))
+    return log_files
+
+
+def _log_format_suffix(config):
+    from pytest_logfest import binary_format
+
+    return {"binary": binary_format.SUFFIX, "jsonl": ".jsonl"}.get(config.getoption("logfest_format"), ".log")
+
+
+def _log_file_suffix(config):
+    compression = config.getoption("logfest_compress")
+    return _log_format_suffix(config) + (COMPRESSION_SUFFIXES[compression] if compression else "")
+
+
+def _xdist_worker_id(config):
+    """Returns the pytest-xdist worker id (e.g. gw0) or None if not running as a pytest-xdist worker"""
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+
+def _xdist_worker_id_component(config):
+    """Returns the filename component that prevents pytest-xdist workers from writing to the same full log file"""
+    worker_id = _xdist_worker_id(config)
+    return [worker_id] if worker_id else []
+
+
+def _xdist_shards_dir(config):
+    return './artifacts/.logfest-shards-%s' % config._timestamp
+
+
+def _getini_int(config, name):
+    value = config.getini(name)
+    if value is None or value == "":
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        raise pytest.UsageError("%s should be an integer, got: %s" % (name, value))
+
+
+def _module_path_components(path_to_module):
+    """Returns the directories in the path to a module, and its file name without suffix"""
+    try:
+        from pathlib import Path
+    except (ImportError, AttributeError):
+        from pathlib2 import Path
+
+    full_path = Path(path_to_module)
+    return list(full_path.parents[0].parts), full_path.stem
+
+
 def _create_directory_if_it_not_exists(path):
     try:
         os.makedirs(path)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Post-processing of the log files of a session with --logfest-postprocess, one log file per task in a process pool.
+
+A processor is a function taking the path to a log file. It returns the new path if it moved or replaced the log
+file (like gzip), otherwise None. Processors run in a process pool, so they should be module-level functions.
+"""
+
+import functools
+import json
+import logging
+import os
+import traceback
+
+from pytest_logfest import binary_format
+from pytest_logfest.compression import compress_file, open_log_file, split_compression_suffix
+from pytest_logfest.merging import read_log_records
+
+WARNING_LEVELS = ("WARNING", "ERROR", "CRITICAL")
+
+
+def summarize_warnings(path_to_file):
+    """Writes the WARNING and higher records of a log file to <log file without suffix>.warnings.log (or .jsonl)"""
+    path_without_compression = split_compression_suffix(path_to_file)[0]
+    root, suffix = os.path.splitext(path_without_compression)
+
+    if suffix == binary_format.SUFFIX:
+        from pytest_logfest.render import render_text
+
+        with open_log_file(path_to_file, "rb") as binary_file:
+            records = [render_text(*frame) for frame in binary_format.read_frames(binary_file)
+                       if frame[1] >= logging.WARNING]
+        suffix = ".log"
+    elif suffix == ".jsonl":
+        with open_log_file(path_to_file, "r") as log_file:
+            records = [line for line in log_file if json.loads(line)["level"] in WARNING_LEVELS]
+    else:
+        # text records start with "HH:MM:SS <level> - "
+        records = [record for record in read_log_records(path_to_file)
+                   if record[9:].split(" ", 1)[0] in WARNING_LEVELS]
+
+    with open_log_file(root + ".warnings" + suffix, "w") as summary_file:
+        summary_file.writelines(records)
+
+
+def gzip_log_file(path_to_file):
+    """Compresses a log file with gzip, unless it already is compressed"""
+    if split_compression_suffix(path_to_file)[1]:
+        return None
+
+    compress_file(path_to_file, "gzip")
+    return path_to_file + ".gz"
+
+
+POSTPROCESSORS = {
+    "warnings": summarize_warnings,
+    "gzip": gzip_log_file,
+}
+
+
+def process_file(path_to_file, processors):
+    """Runs the processors on a log file one after the other and returns a list of errors"""
+    errors = []
+    for processor in processors:
+        try:
+            path_to_file = processor(path_to_file) or path_to_file
+        except Exception:
+            errors.append("%s on %s:\n%s" % (getattr(processor, "__name__", processor), path_to_file,
+                                             traceback.format_exc()))
+    return errors
+
+
+def process_files(paths_to_files, processors, jobs=None):
+    """Runs the processors on every log file, the log files in parallel, and returns a list of errors"""
+    import multiprocessing  # only imported when post-processing, it is slow to import
+
+    process = functools.partial(process_file, processors=processors)
+    jobs = jobs or multiprocessing.cpu_count()
+
+    if jobs > 1 and len(paths_to_files) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(paths_to_files)))
+        try:
+            results = pool.map(process, paths_to_files)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [process(path_to_file) for path_to_file in paths_to_files]
+
+    return [error for errors in results for error in errors]
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""logfest-render: renders binary log files written with --logfest-format=binary to text or JSON Lines"""
+
+import argparse
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from pytest_logfest import binary_format
+from pytest_logfest.compression import open_log_file, split_compression_suffix
+
+OUTPUT_SUFFIXES = {
+    "text": ".log",
+    "json": ".jsonl",
+}
+
+
+def render_text(created_us, levelno, name, msg, args):
+    """Renders a record in the same format as the text log files"""
+    return u"%s %s - %s - %s\n" % (time.strftime("%H:%M:%S", time.localtime(created_us // 1000000)),
+                                   logging.getLevelName(levelno), name, binary_format.render_message(msg, args))
+
+
+def render_json(created_us, levelno, name, msg, args):
+    # text, also on Python 2 where json.dumps returns a byte string (only ASCII, as ensure_ascii is on)
+    return u"%s\n" % json.dumps({
+        "time": created_us / 1000000.0,
+        "level": logging.getLevelName(levelno),
+        "name": name,
+        "message": binary_format.render_message(msg, args),
+    })
+
+
+RENDERERS = {
+    "text": render_text,
+    "json": render_json,
+}
+
+
+def output_path(path_to_file, output_format, output_dir=None):
+    """Returns the path of the rendered file: the same path, without compression suffix and with an output suffix"""
+    path_without_suffix = split_compression_suffix(path_to_file)[0]
+    if path_without_suffix.endswith(binary_format.SUFFIX):
+        path_without_suffix = path_without_suffix[:-len(binary_format.SUFFIX)]
+
+    path = path_without_suffix + OUTPUT_SUFFIXES[output_format]
+    if output_dir:
+        path = os.path.join(output_dir, os.path.basename(path))
+    return path
+
+
+def render_file(path_to_file, output_format="text", output_dir=None):
+    """Renders a binary log file one record at a time and returns the path of the rendered file"""
+    render = RENDERERS[output_format]
+    path_to_output = output_path(path_to_file, output_format, output_dir)
+
+    with open_log_file(path_to_file, "rb") as binary_file:
+        with open_log_file(path_to_output, "w") as output_file:
+            for frame in binary_format.read_frames(binary_file):
+                output_file.write(render(*frame))
+
+    return path_to_output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="logfest-render", description=__doc__)
+    parser.add_argument("files", nargs="+", help="binary log files (%s), optionally compressed" % binary_format.SUFFIX)
+    parser.add_argument("--format", choices=sorted(RENDERERS), default="text", help="Default: text")
+    parser.add_argument("--output-dir", default=None, help="Default: next to the binary log file")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="number of files rendered in parallel. Default: number of CPUs")
+    args = parser.parse_args(argv)
+
+    if args.output_dir and not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    render = functools.partial(render_file, output_format=args.format, output_dir=args.output_dir)
+    jobs = args.jobs or multiprocessing.cpu_count()
+
+    if jobs > 1 and len(args.files) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(args.files)))
+        try:
+            rendered_files = pool.map(render, args.files)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        rendered_files = [render(path_to_file) for path_to_file in args.files]
+
+    for rendered_file in rendered_files:
+        sys.stdout.write(rendered_file + "\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
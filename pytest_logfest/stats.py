@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+COUNTERS = ["records", "bytes", "format_time", "write_time", "flush_time"]
+
+
+def _new_counters():
+    return dict((counter, 0) for counter in COUNTERS)
+
+
+class LogStats(object):
+    """
+    Counts records and bytes written to log files and the time spent formatting, writing and flushing them, per test.
+
+    Counts are attributed to the test set as current_nodeid, or to the session if there is none. With --logfest-async
+    the records are written later on the writer thread, so the attribution to tests is approximate.
+    """
+    def __init__(self):
+        self.current_nodeid = None
+        self.tests = {}
+        self.durations = {}
+        self.outside_tests = _new_counters()
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            if self.current_nodeid is None:
+                counters = self.outside_tests
+            else:
+                counters = self.tests.setdefault(self.current_nodeid, _new_counters())
+
+            for counter, count in counts.items():
+                counters[counter] += count
+
+    def add_duration(self, nodeid, duration):
+        self.durations[nodeid] = self.durations.get(nodeid, 0.0) + duration
+
+    def per_module(self):
+        modules = {}
+        for nodeid, counters in self.tests.items():
+            module_counters = modules.setdefault(nodeid.split("::")[0], _new_counters())
+            for counter in COUNTERS:
+                module_counters[counter] += counters[counter]
+        return modules
+
+    def session(self):
+        session_counters = dict(self.outside_tests)
+        for counters in self.tests.values():
+            for counter in COUNTERS:
+                session_counters[counter] += counters[counter]
+        return session_counters
+
+    def top_tests(self, number):
+        """Returns the number of tests with most time spent in the log file handlers, as (nodeid, counters)"""
+        return sorted(self.tests.items(), key=lambda item: _handler_time(item[1]), reverse=True)[:number]
+
+    def to_dict(self):
+        tests = {}
+        for nodeid, counters in self.tests.items():
+            tests[nodeid] = dict(counters, handler_time=_handler_time(counters),
+                                 duration=self.durations.get(nodeid))
+
+        return {
+            "session": dict(self.session(), handler_time=_handler_time(self.session())),
+            "modules": dict((module, dict(counters, handler_time=_handler_time(counters)))
+                            for module, counters in self.per_module().items()),
+            "tests": tests,
+        }
+
+    def write_json(self, path_to_file):
+        with open(path_to_file, "w") as json_file:
+            json.dump(self.to_dict(), json_file, indent=2, sort_keys=True)
+
+
+def _handler_time(counters):
+    return counters["format_time"] + counters["write_time"] + counters["flush_time"]
@@ -47,5 +47,9 @@ setup(
         'pytest11': [
             'logfest = pytest_logfest.plugin',
         ],
+        'console_scripts': [
+            'logfest-render = pytest_logfest.render:main',
+            'logfest-extract = pytest_logfest.index:main',
+        ],
     },
 )
@@ -0,0 +1,67 @@
+import os
+
+from . import helpers
+
+
+def test_async_logging_full(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-async', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 2
+
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    expected_log_lines = ["TEST STARTED",
+                          "Debug log line",
+                          "TEST FAIL",
+                          "TEST ENDED"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, "session-%s.log" % timestamp), expected_log_lines)
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, "test_async_logging_full-%s.log" % timestamp),
+                                    expected_log_lines)
+
+
+def test_async_logging_drop_on_overflow(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-async-queue-size=1\nlogfest-async-overflow=drop\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            for i in range(10000):
+                function_logger.info("Info log line %d", i)
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--logfest-async', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["Logfest: dropped * log record(s) because the writer queue was full"])
+
+
+def test_async_logging_invalid_overflow(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-async-overflow=explode\n')
+
+    testdir.makepyfile("""
+        def test_pass():
+            pass
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--logfest-async'
+    )
+
+    assert result.ret != 0
+    result.stderr.fnmatch_lines(["*logfest-async-overflow should be block or drop, got: explode*"])
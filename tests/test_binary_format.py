@@ -0,0 +1,66 @@
+import io
+import json
+import logging
+import os
+import sys
+
+from pytest_logfest import binary_format, render
+
+from . import helpers
+
+
+def _make_record(msg, args, exc_info=None):
+    return logging.LogRecord("root.module.test_pass", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_render_text_equals_text_format():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    records = [_make_record("Info log line %d %s", (1, "two")),
+               _make_record("Info log line %(key)s", ({"key": "value"},)),
+               _make_record("Info log line %s", (object(),)),
+               _make_record("Exception log line", None, exc_info)]
+
+    formatter = logging.Formatter('%(asctime)s %(levelname)s - %(name)s - %(message)s', "%H:%M:%S")
+    encoder = binary_format.BinaryRecordEncoder()
+    binary_file = io.BytesIO(binary_format.MAGIC + b"".join(encoder.encode(record) for record in records))
+
+    rendered = [render.render_text(*frame) for frame in binary_format.read_frames(binary_file)]
+
+    assert rendered == [formatter.format(record) + "\n" for record in records]
+
+
+def test_logging_binary_and_render(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line %d", 1)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-format=binary', '--logfest-compress=gzip', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 2
+    assert all(logfile.endswith(".logb.gz") for logfile in log_files)
+
+    paths_to_files = [os.path.join(artifacts_dir, logfile) for logfile in log_files]
+    assert render.main(paths_to_files + ["--jobs", "2"]) == 0
+
+    for path_to_file in paths_to_files:
+        helpers.assert_lines_in_logfile(path_to_file[:-len(".logb.gz")] + ".log",
+                                        ["INFO - ", "TEST STARTED", "DEBUG - ", "Debug log line 1", "TEST FAIL"])
+
+    assert render.main([paths_to_files[0], "--format", "json", "--output-dir", str(testdir.tmpdir)]) == 0
+    with open(str(testdir.tmpdir.join(log_files[0][:-len(".logb.gz")] + ".jsonl"))) as json_file:
+        messages = [json.loads(line)["message"] for line in json_file]
+    assert "Debug log line 1" in messages
@@ -0,0 +1,255 @@
+import logging
+import os
+import threading
+import pytest
+
+from pytest_logfest.logging_classes import MyMemoryHandler
+
+from . import helpers
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super(ListHandler, self).__init__()
+        self.messages = []
+        self.errors = 0
+
+    def emit(self, record):
+        try:
+            self.messages.append(record.getMessage())
+        except TypeError:
+            self.errors += 1
+
+
+def _make_record(level, msg):
+    return logging.LogRecord("logfest.test_module.test_pass", level, __file__, 1, msg, None, None)
+
+
+@pytest.mark.parametrize("spill_threshold", [None, 2])
+def test_memory_handler_flush_keeps_order(spill_threshold):
+    target = ListHandler()
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target,
+                                     spill_threshold=spill_threshold)
+
+    for level, msg in [(logging.INFO, "one"), (logging.DEBUG, "two"), (logging.INFO, "three"),
+                       (logging.DEBUG, "four"), (logging.WARNING, "five")]:
+        memory_handler.handle(_make_record(level, msg))
+
+    assert target.messages == ["one", "two", "three", "four", "five"]
+
+
+@pytest.mark.parametrize("spill_threshold", [None, 2])
+def test_memory_handler_flush_with_filter_on_info(spill_threshold):
+    target = ListHandler()
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target,
+                                     spill_threshold=spill_threshold)
+
+    for level, msg in [(logging.INFO, "one"), (logging.DEBUG, "two"), (logging.INFO, "three"),
+                       (logging.DEBUG, "four")]:
+        memory_handler.handle(_make_record(level, msg))
+    memory_handler.flush_with_filter_on_info()
+
+    assert target.messages == ["one", "three"]
+    assert target.filters == []
+
+    memory_handler.handle(_make_record(logging.DEBUG, "five"))
+    memory_handler.handle(_make_record(logging.WARNING, "six"))
+
+    assert target.messages == ["one", "three", "five", "six"]
+
+
+def test_memory_handler_spill_unpicklable_records():
+    target = ListHandler()
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target, spill_threshold=2)
+
+    record_with_lock = _make_record(logging.DEBUG, "one")
+    record_with_lock.lock = threading.Lock()
+    memory_handler.handle(record_with_lock)
+    memory_handler.handle(logging.LogRecord("logfest.test_module.test_pass", logging.DEBUG, __file__, 1, "%d",
+                                            ("two",), None))
+    memory_handler.handle(_make_record(logging.DEBUG, "three"))
+    memory_handler.handle(_make_record(logging.WARNING, "four"))
+
+    assert target.messages == ["one", "three", "four"]
+    assert target.errors == 1
+
+
+def test_memory_handler_max_bytes_bad_arguments():
+    target = ListHandler()
+    memory_handler = MyMemoryHandler(capacity=None, flushLevel=logging.WARNING, target=target, max_bytes=100)
+
+    memory_handler.handle(logging.LogRecord("logfest.test_module.test_pass", logging.DEBUG, __file__, 1, "%d",
+                                            ("one",), None))
+    memory_handler.handle(_make_record(logging.WARNING, "two"))
+
+    assert target.messages == ["two"]
+    assert target.errors == 1
+
+
+def test_buffer_max_records_drops_oldest(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-max-records=3\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            for i in range(10):
+                function_logger.debug("Debug log line %d", i)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 1
+
+    expected_log_lines = ["Logfest dropped 9 buffered log record(s) due to buffer limit",
+                          "TEST STARTED",
+                          "Debug log line 9",
+                          "TEST FAIL",
+                          "TEST ENDED"]
+    non_expected_log_lines = ["Debug log line 0",
+                              "Debug log line 8"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), expected_log_lines,
+                                    non_expected_log_lines)
+
+
+def test_buffer_max_bytes_drops_oldest(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-max-bytes=40\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            for i in range(10):
+                function_logger.debug("Debug log line %d", i)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+
+    expected_log_lines = ["Logfest dropped",
+                          "Debug log line 9",
+                          "TEST FAIL"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), expected_log_lines,
+                                    ["Debug log line 0"])
+
+
+def test_buffer_limit_invalid_value(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-max-records=many\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            pass
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret != 0
+    result.stdout.fnmatch_lines(["*logfest-buffer-max-records should be an integer, got: many*"])
+
+
+def test_buffer_spill_to_disk_test_fails(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-spill-threshold=3\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            for i in range(10):
+                function_logger.debug("Debug log line %d", i)
+            try:
+                raise ValueError("unpicklable")
+            except ValueError:
+                function_logger.debug("Exception log line", exc_info=True)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 1
+
+    expected_log_lines = ["TEST STARTED",
+                          "Debug log line 0",
+                          "Debug log line 9",
+                          "Exception log line\nTraceback",
+                          "ValueError: unpicklable",
+                          "TEST FAIL",
+                          "TEST ENDED"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), expected_log_lines)
+
+
+def test_buffer_spill_to_disk_unpicklable_records(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-spill-threshold=2\n')
+
+    testdir.makepyfile("""
+        import threading
+        import pytest
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line with lock", extra={"lock": threading.Lock()})
+            function_logger.debug("Debug log line after")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+    result.stdout.no_fnmatch_line("*pickle*")
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+
+    expected_log_lines = ["TEST STARTED",
+                          "Debug log line with lock",
+                          "Debug log line after",
+                          "TEST FAIL"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), expected_log_lines)
+
+
+def test_buffer_spill_to_disk_test_passes(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-buffer-spill-threshold=3\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            for i in range(10):
+                function_logger.debug("Debug log line %d", i)
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), ["TEST STARTED", "TEST ENDED"],
+                                    ["Debug log line"])
@@ -0,0 +1,94 @@
+import gzip
+import lzma
+import os
+import pytest
+
+from pytest_logfest.compression import COMPRESSION_SUFFIXES, compress_file, open_log_file
+
+from . import helpers
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "lzma"])
+def test_open_log_file_appends_text(tmpdir, compression):
+    path_to_file = str(tmpdir.join("session.log" + COMPRESSION_SUFFIXES[compression]))
+
+    for line in [u"Info log line\n", u"Debug log line \u00e9\n"]:
+        with open_log_file(path_to_file, "a") as log_file:
+            log_file.write(line)
+
+    with open_log_file(path_to_file) as log_file:
+        assert log_file.read() == u"Info log line\nDebug log line \u00e9\n"
+
+
+def test_compress_file(tmpdir):
+    path_to_file = tmpdir.join("session.log")
+    path_to_file.write("Info log line\n")
+
+    compress_file(str(path_to_file))
+
+    assert not path_to_file.exists()
+    with gzip.open(str(path_to_file) + ".gz", "rb") as log_file:
+        assert log_file.read() == b"Info log line\n"
+
+
+def test_compressed_logging_full_gzip(testdir):
+    testdir.makeconftest("""
+        import pytest
+
+        @pytest.mark.optionalhook
+        def pytest_logfest_log_file_name_full_module(filename_components):
+            filename_components.append("fizzbuzz")
+    """)
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-compress=gzip', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 2
+
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    basic_logfile = "session-%s.log.gz" % timestamp
+    helpers.assert_filename_in_list_of_files(basic_logfile, log_files)
+    full_logfile = "test_compressed_logging_full_gzip-%s-fizzbuzz.log.gz" % timestamp
+    helpers.assert_filename_in_list_of_files(full_logfile, log_files)
+
+    for logfile in [basic_logfile, full_logfile]:
+        with gzip.open(os.path.join(artifacts_dir, logfile), "rt") as log_file:
+            log = log_file.read()
+        for line in ["TEST STARTED", "Debug log line", "TEST FAIL", "TEST ENDED"]:
+            assert line in log
+
+
+def test_compressed_logging_basic_lzma(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            function_logger.info("Info log line")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--logfest-compress=lzma', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 1
+    assert log_files[0].endswith(".log.xz")
+
+    with lzma.open(os.path.join(artifacts_dir, log_files[0]), "rt") as log_file:
+        assert "Info log line" in log_file.read()
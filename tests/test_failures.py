@@ -0,0 +1,76 @@
+import os
+
+from . import helpers
+
+
+def test_logging_failures(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.fixture
+        def broken_fixture(function_logger):
+            function_logger.debug("Debug log line in fixture")
+            raise Exception
+
+        def test_pass(function_logger):
+            function_logger.debug("Debug log line pass")
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line fail")
+            assert False
+
+        def test_error(broken_fixture):
+            pass
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=failures', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 3
+
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    helpers.assert_filename_in_list_of_files("session-%s.log" % timestamp, log_files)
+
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_logging_failures-test_fail-%s.log" % timestamp),
+        ["test_fail - TEST STARTED", "test_fail - Debug log line fail", "test_fail - TEST FAIL",
+         "test_fail - TEST ENDED"],
+        ["test_pass"])
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_logging_failures-test_error-%s.log" % timestamp),
+        ["test_error - TEST STARTED", "test_error - Debug log line in fixture", "test_error - SETUP ERROR"],
+        ["test_fail"])
+
+
+def test_logging_failures_max_records(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-failures-max-records=3\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            for i in range(10):
+                function_logger.debug("Debug log line %d", i)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=failures', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_logging_failures_max_records-test_fail-%s.log" % timestamp),
+        ["Logfest dropped 10 buffered log record(s) due to buffer limit", "test_fail - Debug log line 9",
+         "test_fail - TEST FAIL", "test_fail - TEST ENDED"],
+        ["Debug log line 8"])
@@ -0,0 +1,45 @@
+import logging
+import sys
+
+from pytest_logfest.logging_classes import LogfestFormatter
+
+
+def _make_record(name, level, msg, args=(), exc_info=None, created=None):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+    if created is not None:
+        record.created = created
+    return record
+
+
+def test_formatter_output_identical_to_logging_formatter():
+    formatter = LogfestFormatter()
+    reference = logging.Formatter('%(asctime)s %(levelname)s - %(name)s - %(message)s', "%H:%M:%S")
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    records = [
+        _make_record("logfest", logging.INFO, "Info log line", created=1500000000.1),
+        _make_record("logfest.tests.test_module", logging.DEBUG, "Debug log line %d", (1,), created=1500000000.9),
+        _make_record("logfest.tests.test_module", logging.WARNING, "Warning log line\n", created=1500000001.0),
+        _make_record("logfest.tests.test_module.test_one", logging.ERROR, "Error log line", exc_info=exc_info,
+                     created=1500000061.5),
+    ]
+
+    for record in records:
+        expected = reference.format(_make_record(record.name, record.levelno, record.msg, record.args,
+                                                 record.exc_info, record.created))
+        assert formatter.format(record) == expected
+
+
+def test_formatter_formats_record_once():
+    formatter = LogfestFormatter()
+    record = _make_record("logfest", logging.INFO, "Info log line %s", ("one",))
+
+    first = formatter.format(record)
+    record.args = ("two",)
+
+    assert formatter.format(record) is first
+    assert LogfestFormatter().format(record) is first
@@ -0,0 +1,68 @@
+import os
+
+from pytest_logfest import index
+
+
+def test_index_full(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_one(function_logger):
+            function_logger.info("Info log line one")
+
+        def test_two(function_logger):
+            function_logger.debug("Debug log line two")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-index', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    index_files = [index_file for index_file in os.listdir(artifacts_dir) if index_file.endswith(".index.jsonl")]
+    assert len(index_files) == 1
+    path_to_index = os.path.join(artifacts_dir, index_files[0])
+
+    entries = list(index.read_index(path_to_index))
+    assert len(entries) == 4
+    assert [entry["outcome"] for entry in entries] == ["passed", "passed", "failed", "failed"]
+
+    logs = index.extract_test_log(path_to_index, "test_index_full.py::test_two")
+    assert len(logs) == 2
+    for path_to_file, log in logs:
+        assert os.path.isfile(path_to_file)
+        assert b"test_two - TEST STARTED" in log
+        assert b"Debug log line two" in log
+        assert b"TEST FAIL" in log
+        assert b"test_one" not in log
+
+
+def test_index_extract_command(testdir, capsysbinary):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_one(function_logger):
+            function_logger.info("Info log line one")
+
+        def test_two(function_logger):
+            function_logger.info("Info log line two")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--logfest-index', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    index_file = [index_file for index_file in os.listdir(artifacts_dir) if index_file.endswith(".index.jsonl")][0]
+
+    assert index.main([os.path.join(artifacts_dir, index_file), "test_index_extract_command.py::test_one"]) == 0
+    out = capsysbinary.readouterr().out
+    assert b"Info log line one" in out
+    assert b"Info log line two" not in out
+
+    assert index.main([os.path.join(artifacts_dir, index_file), "test_index_extract_command.py::test_three"]) == 1
@@ -0,0 +1,51 @@
+import json
+import os
+
+
+def _read_json_lines(path_to_file):
+    with open(path_to_file) as log_file:
+        return [json.loads(line) for line in log_file]
+
+
+def test_json_lines_full(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            function_logger.info("Info log line %d", 1, extra={"request_id": 42})
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-format=jsonl', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = os.listdir(artifacts_dir)
+    assert len(log_files) == 2
+    assert all(log_file.endswith(".jsonl") for log_file in log_files)
+
+    module_logfile = [log_file for log_file in log_files if log_file.startswith("test_json_lines_full-")][0]
+    records = _read_json_lines(os.path.join(artifacts_dir, module_logfile))
+
+    info_record = [record for record in records if record["message"] == "Info log line 1"][0]
+    assert info_record["level"] == "INFO"
+    assert info_record["logger"].endswith("test_json_lines_full.test_pass")
+    assert info_record["nodeid"] == "test_json_lines_full.py::test_pass"
+    assert info_record["extra"] == {"request_id": 42}
+    assert isinstance(info_record["timestamp"], float)
+
+    ended_records = [record for record in records if record["message"] == "TEST ENDED\n"]
+    assert [record["extra"]["outcome"] for record in ended_records] == ["passed", "failed"]
+    assert [record["nodeid"] for record in ended_records] == ["test_json_lines_full.py::test_pass",
+                                                              "test_json_lines_full.py::test_fail"]
+
+    basic_logfile = [log_file for log_file in log_files if log_file.startswith("session-")][0]
+    basic_messages = [record["message"] for record in _read_json_lines(os.path.join(artifacts_dir, basic_logfile))]
+    assert "Debug log line" in basic_messages
+    assert "TEST FAIL" in basic_messages
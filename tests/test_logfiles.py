@@ -41,6 +41,29 @@ def test_logging_quiet(testdir):
     assert os.path.isdir(artifacts_dir) is False
 
 
+def test_logging_full_module_without_records(testdir):
+    testdir.mkpydir("subdir")
+    testdir.tmpdir.join("subdir", "test_silent.py").write("""
+import pytest
+
+@pytest.fixture
+def silent(module_logger):
+    pass
+
+def test_pass(silent):
+    pass
+""")
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    assert os.path.isdir(artifacts_dir) is False
+
+
 def test_logging_basic(testdir):
     testdir.makepyfile("""
         import pytest
@@ -0,0 +1,38 @@
+import os
+
+from . import helpers
+
+
+def test_function_logger_pool(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-function-logger-pool-size=1\n')
+
+    testdir.makepyfile("""
+        import logging
+        import pytest
+
+        @pytest.mark.parametrize("number", range(5))
+        def test_param(function_logger, number):
+            function_logger.debug("Debug log line %d", number)
+            assert function_logger.name.endswith("test_param[%d]" % number)
+
+        def test_no_function_loggers_registered(function_logger):
+            assert not [name for name in logging.Logger.manager.loggerDict if "test_param" in name]
+
+        def test_level_changes_apply(function_logger, caplog):
+            caplog.set_level(logging.WARNING, logger=function_logger.parent.name)
+            assert function_logger.isEnabledFor(logging.DEBUG) is False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_function_logger_pool-%s.log" % timestamp),
+        ["test_function_logger_pool.test_param[%d] - Debug log line %d" % (number, number) for number in range(5)])
@@ -191,3 +191,89 @@ def test_pass(function_logger):
 
     helpers.assert_lines_in_logfile(artifacts_dir + "/" + basic_logfile, expected_log_lines)
     helpers.assert_lines_in_logfile(artifacts_subdir + "/" + full_logfile, expected_log_lines)
+
+
+def test_logger_level_quiet(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-root-node=logfest\n')
+
+    testdir.makepyfile("""
+        import logging
+        import pytest
+
+        def test_pass(session_logger, function_logger, session_filememoryhandler):
+            assert session_filememoryhandler is None
+            assert session_logger.handlers == []
+            assert session_logger.level == logging.NOTSET
+            assert function_logger.isEnabledFor(logging.INFO) is True
+            assert function_logger.isEnabledFor(logging.DEBUG) is False
+    """)
+
+    result = testdir.runpytest(
+        '--logfest=quiet', '--log-level=info'
+    )
+
+    assert result.ret == 0
+
+
+def test_logger_level_basic_live_logging(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-root-node=logfest\n')
+
+    testdir.makepyfile("""
+        import logging
+        import pytest
+
+        def test_pass(session_logger, function_logger):
+            assert len(session_logger.handlers) == 1
+            assert session_logger.level == logging.NOTSET
+            assert function_logger.isEnabledFor(logging.DEBUG) is True
+    """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=info', '--log-cli-level=debug', '-o', 'log_cli=true'
+    )
+
+    assert result.ret == 0
+
+
+def test_logger_level_follows_root_logger(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-root-node=myroot\n')
+
+    testdir.makepyfile("""
+        import logging
+        import pytest
+
+        def test_pass(caplog, session_logger, function_logger):
+            assert session_logger.level == logging.NOTSET
+
+            caplog.set_level(logging.DEBUG)
+            function_logger.debug("Debug log line")
+
+            assert "Debug log line" in caplog.text
+    """)
+
+    result = testdir.runpytest(
+        '--logfest=basic'
+    )
+
+    assert result.ret == 0
+
+
+def test_logger_level_follows_root_logger_with_log_level(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlog_level=INFO\n')
+
+    testdir.makepyfile("""
+        import logging
+        import pytest
+
+        def test_pass(caplog, function_logger):
+            caplog.set_level(logging.DEBUG)
+            function_logger.debug("Debug log line")
+
+            assert "Debug log line" in caplog.text
+    """)
+
+    result = testdir.runpytest(
+        '--logfest=basic'
+    )
+
+    assert result.ret == 0
@@ -0,0 +1,111 @@
+import logging
+import os
+import subprocess
+import sys
+
+from pytest_logfest import index, mmap_writer
+from pytest_logfest.logging_classes import LogfestFileHandler
+
+from . import helpers
+
+
+def test_mmap_writer_full(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-writer=mmap\nlogfest-mmap-chunk-size=64\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_one(function_logger):
+            function_logger.info("Info log line one")
+
+        def test_two(function_logger):
+            function_logger.debug("Debug log line two")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-index', '--logfest-fsync', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    module_logfile = os.path.join(artifacts_dir, "test_mmap_writer_full-%s.log" % timestamp)
+    helpers.assert_lines_in_logfile(module_logfile, ["test_one - Info log line one", "test_two - Debug log line two",
+                                                     "test_two - TEST FAIL"])
+    with open(module_logfile, "rb") as log_file:
+        content = log_file.read()
+    assert b"\0" not in content
+    assert content.endswith(b"TEST ENDED\n\n")
+
+    path_to_index = [os.path.join(artifacts_dir, index_file) for index_file in os.listdir(artifacts_dir)
+                     if index_file.endswith(".index.jsonl")][0]
+    for path_to_file, log in index.extract_test_log(path_to_index, "test_mmap_writer_full.py::test_two"):
+        assert b"test_two - TEST STARTED" in log
+        assert b"test_one" not in log
+
+
+def test_mmap_append_stream_appends_and_truncates(tmpdir):
+    path_to_file = str(tmpdir.join("append.log"))
+    with open(path_to_file, "w") as log_file:
+        log_file.write("first line\n")
+
+    stream = mmap_writer.MmapAppendStream(path_to_file, chunk_size=8)
+    stream.write("second line\n")
+    assert stream.tell() == len("first line\nsecond line\n")
+    assert os.path.getsize(path_to_file) > stream.tell()
+    stream.close()
+
+    with open(path_to_file) as log_file:
+        assert log_file.read() == "first line\nsecond line\n"
+
+
+def test_mmap_writer_falls_back_to_stream(tmpdir, monkeypatch):
+    def mmap_not_supported(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(mmap_writer.mmap, "mmap", mmap_not_supported)
+
+    path_to_file = str(tmpdir.join("fallback.log"))
+    file_handler = LogfestFileHandler(path_to_file, writer="mmap")
+    file_handler.handle(logging.makeLogRecord({"msg": "Info log line"}))
+    file_handler.close()
+
+    assert file_handler.writer == "stream"
+    with open(path_to_file) as log_file:
+        assert log_file.read() == "Info log line\n"
+
+
+def test_mmap_writer_without_utf8_mode(tmpdir):
+    path_to_file = str(tmpdir.join("locale.log"))
+    script = ("import logging, sys\n"
+              "from pytest_logfest.logging_classes import LogfestFileHandler\n"
+              "file_handler = LogfestFileHandler(sys.argv[1], writer='mmap')\n"
+              "file_handler.handle(logging.makeLogRecord({'msg': 'Info log line'}))\n"
+              "file_handler.close()\n"
+              "assert file_handler.writer == 'mmap'\n")
+
+    subprocess.check_call([sys.executable, "-c", script, path_to_file], env=dict(os.environ, PYTHONUTF8="0"))
+
+    with open(path_to_file) as log_file:
+        assert log_file.read() == "Info log line\n"
+
+
+def test_mmap_writer_falls_back_to_stream_when_disk_full(tmpdir, monkeypatch):
+    path_to_file = str(tmpdir.join("disk_full.log"))
+    file_handler = LogfestFileHandler(path_to_file, writer="mmap", mmap_chunk_size=16)
+    file_handler.handle(logging.makeLogRecord({"msg": "Info log line one"}))
+
+    def no_space_left(fd, offset, length):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(mmap_writer, "_preallocate", no_space_left)
+    file_handler.handle(logging.makeLogRecord({"msg": "Info log line two"}))
+    file_handler.close()
+
+    assert file_handler.writer == "stream"
+    with open(path_to_file) as log_file:
+        assert log_file.read() == "Info log line one\nInfo log line two\n"
@@ -0,0 +1,109 @@
+import os
+
+from . import helpers
+
+
+def test_module_handler_closed_at_module_teardown(testdir):
+    test_file1 = testdir.tmpdir.join("test_file_one.py")
+    test_file1.write("""import pytest
+
+def test_pass(function_logger):
+    function_logger.info("Info log line")
+""")
+
+    test_file2 = testdir.tmpdir.join("test_file_two.py")
+    test_file2.write("""import logging
+import pytest
+
+def test_pass(request, function_logger):
+    module_one_loggers = [logger for name, logger in logging.Logger.manager.loggerDict.items()
+                          if name.endswith("test_file_one")]
+    assert len(module_one_loggers) == 1
+    assert module_one_loggers[0].handlers == []
+    assert request.config._logfest_dispatcher.sinks_of(module_one_loggers[0].name) == []
+    assert len(request.config._logfest_module_handler_pool) == 0
+""")
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    log_files = helpers.get_logfiles_in_testdir(str(testdir.tmpdir.join('artifacts')))
+    assert len(log_files) == 3
+
+
+def test_module_handler_pool(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-module-handler-pool-size=1\n')
+
+    test_file1 = testdir.tmpdir.join("test_file_one.py")
+    test_file1.write("""import pytest
+
+def test_pass(function_logger):
+    function_logger.info("Info log line")
+""")
+
+    test_file2 = testdir.tmpdir.join("test_file_two.py")
+    test_file2.write("""import pytest
+
+def test_pass(request, function_logger):
+    pool = request.config._logfest_module_handler_pool
+    assert len(pool) == 1
+    assert list(pool.keys())[0].endswith(".log")
+    assert "test_file_one" in list(pool.keys())[0]
+""")
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+
+def test_module_handler_pool_reuses_handler(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-module-handler-pool-size=2\n')
+
+    testdir.makeconftest("""
+def pytest_collection_modifyitems(items):
+    # test_file_one, test_file_two, test_file_one: sets up the module logger of test_file_one twice
+    items[:] = [items[0], items[2], items[1]]
+""")
+
+    test_file1 = testdir.tmpdir.join("test_file_one.py")
+    test_file1.write("""import pytest
+
+file_handlers = []
+
+def test_first(request, module_logger, function_logger):
+    file_handlers.extend(request.config._logfest_dispatcher.sinks_of(module_logger.name))
+    function_logger.info("Info log line first")
+
+def test_second(request, module_logger, function_logger):
+    assert request.config._logfest_dispatcher.sinks_of(module_logger.name) == file_handlers
+    function_logger.info("Info log line second")
+""")
+
+    test_file2 = testdir.tmpdir.join("test_file_two.py")
+    test_file2.write("""import pytest
+
+def test_pass(request, function_logger):
+    assert len(request.config._logfest_module_handler_pool) == 1
+""")
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug', '-v'
+    )
+
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["test_file_one.py::test_first PASSED*",
+                                 "test_file_two.py::test_pass PASSED*",
+                                 "test_file_one.py::test_second PASSED*"])
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 3
+
+    module_one_logfile = [log_file for log_file in log_files if log_file.startswith("test_file_one")][0]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, module_one_logfile),
+                                    ["Info log line first", "Info log line second"])
@@ -0,0 +1,76 @@
+import os
+
+from pytest_logfest.plugin import POSTPROCESSOR_NAMES
+from pytest_logfest.postprocess import POSTPROCESSORS
+
+from . import helpers
+
+
+def test_postprocess_choices_match_postprocessors():
+    assert sorted(POSTPROCESSOR_NAMES) == sorted(POSTPROCESSORS)
+
+
+def test_postprocess_warnings_and_gzip(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            function_logger.info("Info log line")
+            function_logger.warning("Warning log line")
+
+        def test_fail(function_logger):
+            function_logger.debug("Debug log line")
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-postprocess=warnings', '--logfest-postprocess=gzip', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = sorted(os.listdir(artifacts_dir))
+    assert len(log_files) == 4
+    assert len([log_file for log_file in log_files if log_file.endswith(".log.gz")]) == 2
+
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_postprocess_warnings_and_gzip-%s.warnings.log" % timestamp),
+        ["test_pass - Warning log line", "test_fail - TEST FAIL"],
+        ["Info log line", "Debug log line", "TEST ENDED"])
+
+
+def test_postprocessors_hook(testdir):
+    testdir.makeconftest("""
+        import os
+        import pytest
+
+        def count_lines(path_to_file):
+            with open(path_to_file) as log_file:
+                lines = len(log_file.readlines())
+            with open(path_to_file + ".lines", "w") as count_file:
+                count_file.write(str(lines))
+
+        @pytest.hookimpl(optionalhook=True)
+        def pytest_logfest_postprocessors(config, processors):
+            processors.append(count_lines)
+    """)
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            function_logger.info("Info log line")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    count_files = [count_file for count_file in os.listdir(artifacts_dir) if count_file.endswith(".log.lines")]
+    assert len(count_files) == 1
+    assert testdir.tmpdir.join('artifacts', count_files[0]).read() == "4"
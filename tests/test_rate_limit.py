@@ -0,0 +1,89 @@
+import os
+
+from . import helpers
+
+
+def test_collapse_duplicates(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-collapse-duplicates=true\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            for i in range(10):
+                function_logger.info("Polling attempt %d", i)
+            function_logger.info("Done polling")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=info'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    module_logfile = os.path.join(artifacts_dir, "test_collapse_duplicates-%s.log" % timestamp)
+    expected_log_lines = ["test_pass - TEST STARTED",
+                          "test_pass - Polling attempt 0",
+                          "test_pass - Last log record repeated 9 times",
+                          "test_pass - Done polling",
+                          "test_pass - TEST ENDED (9 duplicate log record(s) collapsed, 0 log record(s) rate limited)"]
+    helpers.assert_lines_in_logfile(module_logfile, expected_log_lines, ["test_pass - Polling attempt 1"])
+
+
+def test_rate_limit(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-rate-limit=0.001\nlogfest-rate-limit-burst=5\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            for i in range(20):
+                function_logger.info("Info log line %d", i)
+            function_logger.warning("Warning log line")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=info'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    module_logfile = os.path.join(artifacts_dir, "test_rate_limit-%s.log" % timestamp)
+    expected_log_lines = ["test_pass - TEST STARTED",
+                          "test_pass - Info log line 0",
+                          "test_pass - Info log line 4",
+                          "test_pass - Warning log line",
+                          "test_pass - TEST ENDED (0 duplicate log record(s) collapsed, 15 log record(s) rate limited)"]
+    helpers.assert_lines_in_logfile(module_logfile, expected_log_lines, ["test_pass - Info log line 5"])
+
+
+def test_no_limiter_counts_without_drops(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-collapse-duplicates=true\nlogfest-rate-limit=1000\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_pass(function_logger):
+            function_logger.info("Info log line")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=info'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+
+    module_logfile = os.path.join(artifacts_dir, "test_no_limiter_counts_without_drops-%s.log" % timestamp)
+    helpers.assert_lines_in_logfile(module_logfile, ["test_pass - TEST ENDED\n"], ["rate limited"])
@@ -0,0 +1,64 @@
+import os
+
+from pytest_logfest import index
+
+
+TEST_FILE = """
+    import pytest
+
+    @pytest.mark.parametrize("number", range(3))
+    def test_log(function_logger, number):
+        function_logger.info("Info log line %d", number)
+"""
+
+
+def test_rotation_keeps_index_offsets_valid(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-rotate-max-bytes=1\n')
+    testdir.makepyfile(TEST_FILE)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-index', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = sorted(log_file for log_file in os.listdir(artifacts_dir)
+                       if log_file.startswith("test_rotation_keeps_index_offsets_valid-"))
+    assert len(log_files) == 3
+    assert [log_file.split(".")[1:] for log_file in log_files] == [["1", "log"], ["2", "log"], ["log"]]
+
+    path_to_index = [os.path.join(artifacts_dir, index_file) for index_file in os.listdir(artifacts_dir)
+                     if index_file.endswith(".index.jsonl")][0]
+    for number in range(3):
+        nodeid = "test_rotation_keeps_index_offsets_valid.py::test_log[%d]" % number
+        logs = index.extract_test_log(path_to_index, nodeid)
+        assert len(logs) == 2
+        for path_to_file, log in logs:
+            assert ("test_log[%d] - TEST STARTED" % number).encode() in log
+            assert ("Info log line %d" % number).encode() in log
+            assert b"TEST ENDED" in log
+
+
+def test_rotation_retention_and_compression(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-rotate-max-bytes=1\nlogfest-rotate-backup-count=1\n'
+                                    'logfest-rotate-compress=true\n')
+    testdir.makepyfile(TEST_FILE)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-index', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = sorted(log_file for log_file in os.listdir(artifacts_dir)
+                       if log_file.startswith("test_rotation_retention_and_compression-"))
+    assert [log_file.split(".")[1:] for log_file in log_files] == [["2", "log", "gz"]]
+
+    path_to_index = [os.path.join(artifacts_dir, index_file) for index_file in os.listdir(artifacts_dir)
+                     if index_file.endswith(".index.jsonl")][0]
+    logs = dict(index.extract_test_log(path_to_index, "test_rotation_retention_and_compression.py::test_log[2]"))
+    module_segment = [path_to_file for path_to_file in logs if "test_rotation_retention" in path_to_file][0]
+    assert module_segment.endswith(".2.log")
+    assert b"Info log line 2" in logs[module_segment]
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+
+from . import helpers
+
+
+def test_logging_sqlite(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.fixture(scope='session', autouse=True)
+        def session(session_logger):
+            session_logger.info("Session info log line")
+
+        def test_one(function_logger):
+            function_logger.debug("Debug log line one")
+
+        def test_two(function_logger):
+            function_logger.warning("Warning log line two")
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=sqlite', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 1
+    assert log_files[0].startswith("session-")
+
+    connection = sqlite3.connect(os.path.join(artifacts_dir, "logfest.sqlite"))
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        rows = connection.execute("SELECT nodeid, levelname, message FROM records ORDER BY id").fetchall()
+        assert (None, "INFO", "Session info log line") in rows
+        assert ("test_logging_sqlite.py::test_one", "DEBUG", "Debug log line one") in rows
+        assert ("test_logging_sqlite.py::test_two", "INFO", "TEST STARTED") in rows
+
+        rows = connection.execute("SELECT nodeid, message FROM records WHERE level >= 30").fetchall()
+        assert rows == [("test_logging_sqlite.py::test_two", "Warning log line two")]
+
+        index_names = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='index'")]
+        assert sorted(index_names) == ["records_created", "records_level", "records_logger", "records_nodeid"]
+    finally:
+        connection.close()
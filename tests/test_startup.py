@@ -0,0 +1,15 @@
+def test_logging_classes_not_imported_without_logfest(testdir):
+    testdir.makepyfile("""
+        import sys
+
+        def test_pass(request):
+            assert "pytest_logfest.logging_classes" not in sys.modules
+            assert "pytest_logfest.postprocess" not in sys.modules
+            assert "pytest_logfest.merging" not in sys.modules
+            assert "pytest_logfest.binary_format" not in sys.modules
+            assert "root_log_node" not in request.fixturenames
+    """)
+
+    result = testdir.runpytest_subprocess()
+
+    assert result.ret == 0
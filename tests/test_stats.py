@@ -0,0 +1,55 @@
+import json
+import logging
+import os
+
+from pytest_logfest.logging_classes import LogfestFileHandler
+from pytest_logfest.stats import LogStats
+
+
+def test_logging_stats(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-stats-top=1\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_quiet(function_logger):
+            pass
+
+        def test_chatty(function_logger):
+            for i in range(100):
+                function_logger.debug("Debug log line %d", i)
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-stats', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["*logfest: top 1 tests by time spent writing log files*",
+                                 "*s      10? records *test_logging_stats.py::test_chatty"])
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    stats_files = [stats_file for stats_file in os.listdir(artifacts_dir) if stats_file.startswith("logfest-stats-")]
+    assert len(stats_files) == 1
+
+    with open(os.path.join(artifacts_dir, stats_files[0])) as stats_file:
+        stats = json.load(stats_file)
+
+    chatty = stats["tests"]["test_logging_stats.py::test_chatty"]
+    quiet = stats["tests"]["test_logging_stats.py::test_quiet"]
+    assert chatty["records"] > quiet["records"] >= 2
+    assert chatty["bytes"] > quiet["bytes"]
+    assert chatty["duration"] > 0
+    assert stats["modules"]["test_logging_stats.py"]["records"] == chatty["records"] + quiet["records"]
+    assert stats["session"]["records"] >= stats["modules"]["test_logging_stats.py"]["records"]
+
+
+def test_logging_stats_counts_bytes(tmpdir):
+    stats = LogStats()
+    path_to_file = str(tmpdir.join("session.log"))
+    file_handler = LogfestFileHandler(path_to_file, encoding="utf-8", stats=stats)
+
+    file_handler.handle(logging.makeLogRecord({"msg": u"Info log line \u00e9\u20ac", "levelno": logging.INFO}))
+    file_handler.close()
+
+    assert stats.outside_tests["bytes"] == os.path.getsize(path_to_file)
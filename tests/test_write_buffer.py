@@ -0,0 +1,63 @@
+import os
+
+from . import helpers
+
+
+def test_write_buffer_commits_at_end_of_test(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-write-buffer-size=1000000\n')
+
+    testdir.makepyfile("""
+        import glob
+        import pytest
+
+        def test_one(function_logger):
+            function_logger.debug("Debug log line one")
+
+        def test_two(function_logger):
+            module_logfile = glob.glob("artifacts/test_write_buffer_commits_at_end_of_test-*.log")[0]
+            with open(module_logfile) as log_file:
+                assert "Debug log line one" in log_file.read()
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--logfest-fsync', '--log-level=debug'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    assert len(log_files) == 2
+
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    expected_log_lines = ["test_one - TEST STARTED",
+                          "test_one - Debug log line one",
+                          "test_two - TEST ENDED"]
+    helpers.assert_lines_in_logfile(
+        os.path.join(artifacts_dir, "test_write_buffer_commits_at_end_of_test-%s.log" % timestamp),
+        expected_log_lines)
+
+
+def test_write_buffer_async(testdir):
+    testdir.makefile(".ini", pytest='[pytest]\nlogfest-write-buffer-size=100\nlogfest-write-buffer-seconds=0.1\n')
+
+    testdir.makepyfile("""
+        import pytest
+
+        def test_fail(function_logger):
+            for i in range(100):
+                function_logger.debug("Debug log line %d", i)
+            assert False
+     """)
+
+    result = testdir.runpytest(
+        '--logfest=basic', '--logfest-async', '--log-level=debug'
+    )
+
+    assert result.ret == 1
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+
+    expected_log_lines = ["Debug log line 0", "Debug log line 99", "TEST FAIL", "TEST ENDED"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, log_files[0]), expected_log_lines)
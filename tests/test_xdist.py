@@ -0,0 +1,79 @@
+import os
+import pytest
+
+from pytest_logfest.merging import merge_log_files
+
+from . import helpers
+
+
+def test_merge_log_files(tmpdir):
+    shard_one = tmpdir.join("gw0.log")
+    shard_one.write("10:00:00 INFO - a - one\n"
+                    "10:00:02 WARNING - a - three\n"
+                    "Traceback (most recent call last):\n"
+                    "10:00:03 INFO - a - four\n\n")
+    shard_two = tmpdir.join("gw1.log")
+    shard_two.write("10:00:01 INFO - b - two\n"
+                    "10:00:03 INFO - b - five\n")
+
+    merged_file = tmpdir.join("merged.log")
+    merge_log_files([str(shard_one), str(shard_two)], str(merged_file))
+
+    assert merged_file.read() == ("10:00:00 INFO - a - one\n"
+                                  "10:00:01 INFO - b - two\n"
+                                  "10:00:02 WARNING - a - three\n"
+                                  "Traceback (most recent call last):\n"
+                                  "10:00:03 INFO - a - four\n\n"
+                                  "10:00:03 INFO - b - five\n")
+
+
+def test_merge_log_files_across_midnight(tmpdir):
+    shard_one = tmpdir.join("gw0.log")
+    shard_one.write("23:59:58 INFO - a - one\n"
+                    "00:00:01 INFO - a - four\n")
+    shard_two = tmpdir.join("gw1.log")
+    shard_two.write("23:59:59 INFO - b - two\n"
+                    "23:59:59 INFO - b - three\n"
+                    "00:00:02 INFO - b - five\n")
+
+    merged_file = tmpdir.join("merged.log")
+    merge_log_files([str(shard_one), str(shard_two)], str(merged_file))
+
+    assert merged_file.read() == ("23:59:58 INFO - a - one\n"
+                                  "23:59:59 INFO - b - two\n"
+                                  "23:59:59 INFO - b - three\n"
+                                  "00:00:01 INFO - a - four\n"
+                                  "00:00:02 INFO - b - five\n")
+
+
+def test_xdist_logging_full(testdir):
+    pytest.importorskip("xdist")
+
+    for number in ["one", "two", "three", "four"]:
+        test_file = testdir.tmpdir.join("test_file_%s.py" % number)
+        test_file.write("""import pytest
+
+def test_pass(function_logger):
+    function_logger.info("Info log line %s")
+""" % number)
+
+    result = testdir.runpytest(
+        '--logfest=full', '--log-level=debug', '-n', '2'
+    )
+
+    assert result.ret == 0
+
+    artifacts_dir = str(testdir.tmpdir.join('artifacts'))
+    assert os.listdir(artifacts_dir) == [logfile for logfile in os.listdir(artifacts_dir) if ".logfest" not in logfile]
+
+    log_files = helpers.get_logfiles_in_testdir(artifacts_dir)
+    timestamp = helpers.get_timestamp_from_logfile_name(log_files[0])
+    basic_logfile = "session-%s.log" % timestamp
+    helpers.assert_filename_in_list_of_files(basic_logfile, log_files)
+
+    expected_log_lines = ["Info log line one", "Info log line two", "Info log line three", "Info log line four"]
+    helpers.assert_lines_in_logfile(os.path.join(artifacts_dir, basic_logfile), expected_log_lines)
+
+    module_logfiles = [logfile for logfile in log_files if logfile.startswith("test_file_")]
+    assert len(module_logfiles) == 4
+    assert all(logfile.endswith(("-gw0.log", "-gw1.log")) for logfile in module_logfiles)